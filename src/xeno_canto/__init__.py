@@ -3,6 +3,12 @@
 __version__ = '0.1.0'
 
 from .client.client import Client
+from .audio.audio import XenoCantoAudio
+from .client.client_crawler import JsonLinesSink
+from .catalogue.catalogue_store import RecordStore
+from .client.client_transport import TransportConfig
+from .client.client_cache import CacheConfig
+from .download.download_store import ObjectStore
 from .tags import tags
 from .recording.recording import (
   XenoCantoRecording,
@@ -11,7 +17,13 @@ from .recording.recording import (
 
 __all__ = [
   'Client',
+  'JsonLinesSink',
+  'RecordStore',
+  'TransportConfig',
+  'CacheConfig',
+  'ObjectStore',
   'tags',
   'XenoCantoRecording',
   'XenoCantoRecordingLean',
+  'XenoCantoAudio',
 ]
@@ -0,0 +1,139 @@
+from xeno_canto.recording.recording import XenoCantoRecordingLean
+from xeno_canto.audio.audio_backend import require
+from xeno_canto.audio.audio_processing import (
+  BIRDNET_SAMPLE_RATE,
+  BIRDNET_WINDOW_SECONDS,
+  preprocess_batch,
+)
+
+from typing import (
+  Any,
+  Callable,
+  Iterable,
+  Literal,
+  Optional,
+  Tuple,
+)
+import io
+
+SampleFormat = Literal['float32', 'int16']
+
+
+class XenoCantoAudio:
+  def __init__(
+    self,
+    recording: XenoCantoRecordingLean,
+    fetch: Callable[[XenoCantoRecordingLean, Optional[float]], bytes],
+  ):
+    self.recording = recording
+    self._fetch = fetch
+    self._buffer: Optional[bytes] = None
+    self._max_seconds: Optional[float] = None
+    self._info: Any = None
+
+  def __getattr__(self, name: str) -> Any:
+    # Metadata (number, genus, length, ...) is read from the wrapped recording
+    if name == 'recording':
+      raise AttributeError(name)
+    return getattr(self.recording, name)
+
+  def __repr__(self) -> str:
+    return f'{type(self).__name__}(number={self.recording.number}, loaded={self.loaded})'
+
+  def __enter__(self) -> 'XenoCantoAudio':
+    return self if self.loaded else self.load()
+
+  def __exit__(self, *exc) -> None:
+    self.release()
+
+  @property
+  def loaded(self) -> bool:
+    return self._buffer is not None
+
+  def load(self, max_seconds: Optional[float] = None) -> 'XenoCantoAudio':
+    # With `max_seconds`, only (roughly) that prefix of the file is fetched
+    if self._buffer is None or max_seconds != self._max_seconds:
+      if not self.recording.file_download:
+        raise ValueError(f'Recording {self.recording.number} has no downloadable file')
+      self._buffer = self._fetch(self.recording, max_seconds)
+      self._max_seconds = max_seconds
+      self._info = None
+    return self
+
+  def release(self) -> None:
+    self._buffer = None
+    self._info = None
+
+  def _require_buffer(self) -> bytes:
+    if self._buffer is None:
+      raise RuntimeError(f'Audio of recording {self.recording.number} is not loaded; call load() first')
+    return self._buffer
+
+  @property
+  def info(self) -> Any:
+    if self._info is None:
+      sf = require('soundfile')
+      self._info = sf.info(io.BytesIO(self._require_buffer()))
+    return self._info
+
+  @property
+  def sample_rate(self) -> int:
+    return self.info.samplerate
+
+  @property
+  def channels(self) -> int:
+    return self.info.channels
+
+  @property
+  def frames(self) -> int:
+    return self.info.frames
+
+  def to_numpy(
+    self,
+    dtype: SampleFormat = 'float32',
+    start: int = 0,
+    stop: Optional[int] = None,
+    mono: bool = False,
+  ):
+    # start/stop are sample (frame) indices; only that part of the file is decoded
+    sf = require('soundfile')
+
+    data, _ = sf.read(
+      io.BytesIO(self._require_buffer()),
+      start=start,
+      stop=stop,
+      dtype=dtype,
+      always_2d=False,
+    )
+
+    if mono and data.ndim == 2:
+      data = data.mean(axis=1).astype(dtype)
+
+    return data
+
+  def to_birdnet(self, overlap: float = 0.0):
+    # Mono, 48kHz, 3 second windows of shape (n_windows, 144000)
+    segments, _ = preprocess_batch(
+      [self.to_numpy(mono=True)],
+      [self.sample_rate],
+      target_rate=BIRDNET_SAMPLE_RATE,
+      window_seconds=BIRDNET_WINDOW_SECONDS,
+      overlap_seconds=overlap,
+    )
+    return segments
+
+
+def to_birdnet_batch(audios: Iterable[XenoCantoAudio], overlap: float = 0.0) -> Tuple[Any, Any]:
+  # Returns (segments, numbers): the windows of all recordings and the catalogue number each window came from
+  np = require('numpy')
+
+  audios = list(audios)
+  segments, owners = preprocess_batch(
+    [a.to_numpy(mono=True) for a in audios],
+    [a.sample_rate for a in audios],
+    target_rate=BIRDNET_SAMPLE_RATE,
+    window_seconds=BIRDNET_WINDOW_SECONDS,
+    overlap_seconds=overlap,
+  )
+  numbers = np.array([a.recording.number for a in audios], dtype=np.int64)
+  return segments, numbers[owners]
@@ -0,0 +1,12 @@
+from types import ModuleType
+import importlib
+
+
+def require(module: str, extra: str = 'audio') -> ModuleType:
+  # numpy, soundfile and pandas are optional; only the audio and DataFrame features need them
+  try:
+    return importlib.import_module(module)
+  except ImportError:
+    raise ImportError(
+      f"This feature requires the '{module}' package; install it with: pip install 'xc-api-py[{extra}]'"
+    ) from None
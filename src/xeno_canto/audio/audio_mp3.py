@@ -0,0 +1,147 @@
+from typing import (
+  NamedTuple,
+  Optional,
+)
+
+# kbps, indexed by [layer][bitrate index]; 0 marks 'free' and None 'bad'
+_BITRATES_V1 = {
+  1: (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448, None),
+  2: (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384, None),
+  3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, None),
+}
+_BITRATES_V2 = {
+  1: (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256, None),
+  2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160, None),
+  3: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160, None),
+}
+# Version bits: 0=MPEG 2.5, 2=MPEG 2, 3=MPEG 1
+_SAMPLE_RATES = {
+  0: (11025, 12000, 8000),
+  2: (22050, 24000, 16000),
+  3: (44100, 48000, 32000),
+}
+
+
+class FrameHeader(NamedTuple):
+  length: int  # bytes, including the header
+  samples: int
+  sample_rate: int
+  bitrate: int  # bits per second
+
+
+def id3v2_size(data: bytes) -> int:
+  if len(data) < 10 or data[:3] != b'ID3':
+    return 0
+
+  # Syncsafe integer: 7 bits per byte
+  size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+  footer = 10 if data[5] & 0x10 else 0
+  return 10 + size + footer
+
+
+def parse_frame_header(data: bytes, pos: int = 0) -> Optional[FrameHeader]:
+  if pos + 4 > len(data):
+    return None
+
+  b1, b2 = data[pos + 1], data[pos + 2]
+  if data[pos] != 0xFF or (b1 & 0xE0) != 0xE0:
+    return None
+
+  version = (b1 >> 3) & 0x03
+  layer = 4 - ((b1 >> 1) & 0x03)
+  bitrate_index = (b2 >> 4) & 0x0F
+  rate_index = (b2 >> 2) & 0x03
+  padding = (b2 >> 1) & 0x01
+
+  if version == 1 or layer == 4 or rate_index == 3:
+    return None
+
+  kbps = (_BITRATES_V1 if version == 3 else _BITRATES_V2)[layer][bitrate_index]
+  if not kbps:
+    return None
+
+  bitrate = kbps * 1000
+  sample_rate = _SAMPLE_RATES[version][rate_index]
+
+  if layer == 1:
+    samples = 384
+    length = (12 * bitrate // sample_rate + padding) * 4
+  elif layer == 3 and version != 3:
+    samples = 576
+    length = 72 * bitrate // sample_rate + padding
+  else:
+    samples = 1152
+    length = 144 * bitrate // sample_rate + padding
+
+  return FrameHeader(length=length, samples=samples, sample_rate=sample_rate, bitrate=bitrate)
+
+
+def first_frame(data: bytes) -> Optional[int]:
+  # Offset of the first frame whose successor is also a valid header, skipping any ID3v2 tag
+  pos = id3v2_size(data)
+
+  while pos + 4 <= len(data):
+    header = parse_frame_header(data, pos)
+    if header is not None and (
+      pos + header.length + 4 > len(data) or parse_frame_header(data, pos + header.length) is not None
+    ):
+      return pos
+    pos += 1
+
+  return None
+
+
+def trim_frames(data: bytes, max_seconds: float) -> Optional[bytes]:
+  # Cuts `data` on the frame boundary at `max_seconds`, or after its last complete frame; None if it isn't MPEG audio
+  pos = first_frame(data)
+  if pos is None:
+    return None
+
+  # A leading Xing/Info frame carries no audio, only whole-file stats that decoders trust over the data
+  xing = pos
+  header = parse_frame_header(data, pos)
+  xing_len = header.length if header is not None and _xing_offset(data[pos : pos + header.length]) is not None else 0
+  pos += xing_len
+
+  n_frames = 0
+  elapsed = 0.0
+  while (header := parse_frame_header(data, pos)) is not None:
+    if pos + header.length > len(data) or elapsed >= max_seconds:
+      break
+    pos += header.length
+    n_frames += 1
+    elapsed += header.samples / header.sample_rate
+
+  if not xing_len:
+    return data[:pos]
+
+  tag = _patch_xing(data[xing : xing + xing_len], n_frames, pos - xing)
+  return data[:xing] + tag + data[xing + xing_len : pos]
+
+
+def _xing_offset(frame: bytes) -> Optional[int]:
+  for marker in (b'Xing', b'Info'):
+    i = frame.find(marker, 4, 64)
+    if i >= 0:
+      return i
+  return None
+
+
+def _patch_xing(frame: bytes, n_frames: int, n_bytes: int) -> bytes:
+  # Rewrite the frame/byte counts for the trimmed stream and disable the (now wrong) seek table
+  i = _xing_offset(frame)
+  if i is None:
+    return frame
+
+  out = bytearray(frame)
+  flags = int.from_bytes(out[i + 4 : i + 8], 'big')
+  field = i + 8
+
+  if flags & 0x1:
+    out[field : field + 4] = n_frames.to_bytes(4, 'big')
+    field += 4
+  if flags & 0x2:
+    out[field : field + 4] = n_bytes.to_bytes(4, 'big')
+
+  out[i + 4 : i + 8] = (flags & ~0x4).to_bytes(4, 'big')
+  return bytes(out)
@@ -0,0 +1,124 @@
+from xeno_canto.audio.audio_backend import require
+
+from functools import lru_cache
+from typing import (
+  Any,
+  List,
+  Optional,
+  Sequence,
+  Tuple,
+)
+import math
+
+BIRDNET_SAMPLE_RATE = 48000
+BIRDNET_WINDOW_SECONDS = 3.0
+
+_TAPS_PER_SIDE = 10  # Filter half-length, in input samples at the lower of the two rates
+_KAISER_BETA = 5.0
+_BLOCK_ROWS = 4096  # Output rows (of `up` samples each) computed per block
+
+
+@lru_cache(maxsize=16)
+def _polyphase_filter(up: int, down: int) -> Any:
+  # Kaiser-windowed sinc low-pass at the lower Nyquist rate, split into `up` phases of equal length
+  np = require('numpy')
+
+  half = _TAPS_PER_SIDE * max(up, down)
+  cutoff = 1.0 / max(up, down)
+  n = np.arange(-half, half + 1)
+  h = cutoff * np.sinc(cutoff * n) * np.kaiser(2 * half + 1, _KAISER_BETA)
+  h *= up / h.sum()
+
+  taps = -(-len(h) // up)
+  h = np.concatenate([h, np.zeros(taps * up - len(h))])
+  # Row p holds h[p], h[p + up], ... reversed, so it dots directly with a forward window of the input
+  return np.ascontiguousarray(h.reshape(taps, up).T[:, ::-1], dtype=np.float32), half
+
+
+def resample(x: Any, rate: int, target_rate: int) -> Any:
+  # Polyphase resampling by up/down = target_rate/rate. Output row q holds samples q*up ... q*up + up - 1;
+  # phase r of every row reads a window starting at q*down + offset[r], so one strided view per phase
+  # covers all rows and memory stays proportional to the signal, computed in fixed-size blocks
+  np = require('numpy')
+
+  x = np.asarray(x, dtype=np.float32)
+  if rate == target_rate:
+    return x
+
+  g = math.gcd(rate, target_rate)
+  up, down = target_rate // g, rate // g
+  h, half = _polyphase_filter(up, down)
+  taps = h.shape[1]
+
+  m = int(round(len(x) * up / down))
+  rows = -(-m // up)
+  phase = (np.arange(up) * down + half) % up
+  offset = (np.arange(up) * down + half) // up
+
+  tail = max(0, (rows - 1) * down + int(offset.max()) + 1 - len(x))
+  x = np.concatenate([np.zeros(taps - 1, dtype=np.float32), x, np.zeros(tail, dtype=np.float32)])
+  windows = np.lib.stride_tricks.sliding_window_view(x, taps)
+
+  y = np.empty((rows, up), dtype=np.float32)
+  for q0 in range(0, rows, _BLOCK_ROWS):
+    q1 = min(rows, q0 + _BLOCK_ROWS)
+    for r in range(up):
+      start = q0 * down + int(offset[r])
+      y[q0:q1, r] = windows[start : start + (q1 - q0 - 1) * down + 1 : down] @ h[phase[r]]
+
+  return y.reshape(-1)[:m]
+
+
+def resample_batch(signals: Sequence[Any], rates: Sequence[int], target_rate: int) -> List[Any]:
+  # Each signal is resampled on its own, so memory never scales with batch size times the longest signal;
+  # signals sharing a source rate share one cached filter
+  if len(signals) != len(rates):
+    raise ValueError('Expected one sample rate per signal')
+
+  return [resample(x, rate, target_rate) for x, rate in zip(signals, rates)]
+
+
+def segment(x: Any, rate: int, window_seconds: float, hop_seconds: Optional[float] = None, pad: bool = True) -> Any:
+  # Returns a strided (zero-copy) view of shape (n_windows, window); the tail is zero-padded when `pad` is set
+  np = require('numpy')
+
+  w = int(round(window_seconds * rate))
+  hop = int(round((hop_seconds or window_seconds) * rate))
+  if w < 1 or hop < 1:
+    raise ValueError('Window and hop must span at least one sample')
+
+  x = np.asarray(x)
+  if pad:
+    n = 1 + max(0, -(-(len(x) - w) // hop))
+    padded_len = (n - 1) * hop + w
+    if padded_len > len(x):
+      x = np.concatenate([x, np.zeros(padded_len - len(x), dtype=x.dtype)])
+  elif len(x) < w:
+    return np.empty((0, w), dtype=x.dtype)
+
+  return np.lib.stride_tricks.sliding_window_view(x, w)[::hop]
+
+
+def preprocess_batch(
+  signals: Sequence[Any],
+  rates: Sequence[int],
+  target_rate: int = BIRDNET_SAMPLE_RATE,
+  window_seconds: float = BIRDNET_WINDOW_SECONDS,
+  overlap_seconds: float = 0.0,
+) -> Tuple[Any, Any]:
+  # Returns (segments, owners): all windows stacked in one array, and the index of the signal each came from
+  np = require('numpy')
+
+  if not 0 <= overlap_seconds < window_seconds:
+    raise ValueError(overlap_seconds)
+
+  resampled = resample_batch(signals, rates, target_rate)
+  views = [segment(x, target_rate, window_seconds, window_seconds - overlap_seconds) for x in resampled]
+
+  w = int(round(window_seconds * target_rate))
+  if not views:
+    return np.empty((0, w), dtype=np.float32), np.empty(0, dtype=np.int64)
+
+  segments = np.concatenate(views, axis=0)
+  owners = np.repeat(np.arange(len(views)), [len(v) for v in views])
+  return segments, owners
@@ -0,0 +1,149 @@
+from xeno_canto.audio.audio_backend import require
+from xeno_canto.audio.audio_processing import resample_batch
+
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from pathlib import Path
+from typing import (
+  Any,
+  List,
+  Optional,
+  Sequence,
+  Union,
+)
+import hashlib
+import json
+import os
+
+
+@dataclass(frozen=True)
+class SpectrogramParams:
+  sample_rate: int = 22050
+  n_fft: int = 1024
+  hop_length: int = 256
+  n_mels: Optional[int] = 128  # None for a linear-frequency STFT
+  fmin: float = 0.0
+  fmax: Optional[float] = None
+  power: float = 2.0
+  log: bool = True
+
+  @property
+  def key(self) -> str:
+    raw = json.dumps(asdict(self), sort_keys=True)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:12]
+
+
+def _hz_to_mel(f):
+  np = require('numpy')
+  return 2595.0 * np.log10(1.0 + np.asarray(f) / 700.0)
+
+
+def _mel_to_hz(m):
+  np = require('numpy')
+  return 700.0 * (10.0 ** (np.asarray(m) / 2595.0) - 1.0)
+
+
+@lru_cache(maxsize=16)
+def mel_filterbank(params: SpectrogramParams) -> Any:
+  # Triangular HTK-style filters, shape (n_mels, n_fft // 2 + 1)
+  np = require('numpy')
+
+  fmax = params.fmax or params.sample_rate / 2
+  fft_freqs = np.fft.rfftfreq(params.n_fft, d=1.0 / params.sample_rate)
+  mel_points = np.linspace(_hz_to_mel(params.fmin), _hz_to_mel(fmax), (params.n_mels or 0) + 2)
+  hz_points = _mel_to_hz(mel_points)
+
+  lower = hz_points[:-2, None]
+  center = hz_points[1:-1, None]
+  upper = hz_points[2:, None]
+
+  rising = (fft_freqs[None, :] - lower) / np.maximum(center - lower, 1e-10)
+  falling = (upper - fft_freqs[None, :]) / np.maximum(upper - center, 1e-10)
+  return np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32)
+
+
+def spectrogram(x: Any, rate: int, params: SpectrogramParams, block_frames: int = 1024) -> Any:
+  # Returns an (n_frames, n_bins) array; frames are strided views, windowed and transformed `block_frames` at a time
+  np = require('numpy')
+
+  (x,) = resample_batch([x], [rate], params.sample_rate)
+  if len(x) < params.n_fft:
+    x = np.concatenate([x, np.zeros(params.n_fft - len(x), dtype=x.dtype)])
+
+  frames = np.lib.stride_tricks.sliding_window_view(x, params.n_fft)[:: params.hop_length]
+  window = np.hanning(params.n_fft).astype(np.float32)
+  mel = mel_filterbank(params).T if params.n_mels else None
+
+  out = np.empty((len(frames), params.n_mels or params.n_fft // 2 + 1), dtype=np.float32)
+  for i in range(0, len(frames), block_frames):
+    spec = np.abs(np.fft.rfft(frames[i : i + block_frames] * window, axis=-1)).astype(np.float32) ** params.power
+    if mel is not None:
+      spec = spec @ mel
+    if params.log:
+      spec = 10.0 * np.log10(np.maximum(spec, 1e-10))
+    out[i : i + block_frames] = spec
+
+  return out
+
+
+def compute_spectrograms(signals: Sequence[Any], rates: Sequence[int], params: SpectrogramParams) -> List[Any]:
+  # One (n_frames, n_bins) array per signal; signals are processed one at a time, so peak memory follows
+  # the longest signal rather than the batch
+  if len(signals) != len(rates):
+    raise ValueError('Expected one sample rate per signal')
+
+  return [spectrogram(x, rate, params) for x, rate in zip(signals, rates)]
+
+
+class SpectrogramCache:
+  # One .npy file per (parameters, catalogue number); reads are memory-mapped, so nothing is copied until used
+  def __init__(self, root: Union[str, Path]):
+    self._root = Path(root)
+
+  def _dir(self, params: SpectrogramParams) -> Path:
+    d = self._root / params.key
+    if not d.exists():
+      d.mkdir(parents=True, exist_ok=True)
+      (d / 'params.json').write_text(json.dumps(asdict(params), indent=2), encoding='utf-8')
+    return d
+
+  def path(self, number: int, params: SpectrogramParams) -> Path:
+    return self._root / params.key / f'xc{number}.npy'
+
+  def get(self, number: int, params: SpectrogramParams) -> Optional[Any]:
+    np = require('numpy')
+
+    p = self.path(number, params)
+    if not p.exists():
+      return None
+    return np.load(p, mmap_mode='r')
+
+  def put(self, number: int, params: SpectrogramParams, spec: Any) -> None:
+    np = require('numpy')
+
+    p = self._dir(params) / f'xc{number}.npy'
+    tmp = p.with_suffix('.npy.tmp')
+    with tmp.open('wb') as f:
+      np.save(f, spec)
+    os.replace(tmp, p)
+
+  def get_or_compute(self, audios: Sequence[Any], params: SpectrogramParams, batch_size: int = 8) -> List[Any]:
+    # `audios` are XenoCantoAudio records; only those missing from the cache are fetched and decoded,
+    # `batch_size` at a time, and each batch is released once its spectrograms are written
+    if batch_size < 1:
+      raise ValueError(batch_size)
+
+    missing = [a for a in audios if not self.path(a.recording.number, params).exists()]
+
+    for i in range(0, len(missing), batch_size):
+      batch = missing[i : i + batch_size]
+      was_loaded = [a.loaded for a in batch]
+      try:
+        for a in batch:
+          self.put(a.recording.number, params, spectrogram(a.load().to_numpy(mono=True), a.sample_rate, params))
+      finally:
+        for a, loaded in zip(batch, was_loaded):
+          if not loaded:
+            a.release()
+
+    return [self.get(a.recording.number, params) for a in audios]
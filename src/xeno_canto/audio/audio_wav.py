@@ -0,0 +1,58 @@
+from typing import (
+  NamedTuple,
+  Optional,
+)
+import struct
+
+_CHUNK = struct.Struct('<4sI')
+
+
+class WavLayout(NamedTuple):
+  data_offset: int  # bytes before the first sample
+  data_size: int  # declared size of the data chunk
+  byte_rate: int
+  block_align: int
+
+  def prefix_size(self, max_seconds: float) -> int:
+    # Bytes up to `max_seconds` of audio, in whole sample frames
+    blocks = int(max_seconds * self.byte_rate) // self.block_align
+    return self.data_offset + min(self.data_size, blocks * self.block_align)
+
+
+def wav_layout(data: bytes) -> Optional[WavLayout]:
+  # Walks the RIFF chunks up to `data`; None if `data` is not a WAV header or is cut before the data chunk
+  if len(data) < 12 or data[:4] != b'RIFF' or data[8:12] != b'WAVE':
+    return None
+
+  pos = 12
+  byte_rate = block_align = 0
+  while pos + _CHUNK.size <= len(data):
+    chunk_id, size = _CHUNK.unpack_from(data, pos)
+    body = pos + _CHUNK.size
+
+    if chunk_id == b'fmt ' and body + 16 <= len(data):
+      _, _, _, byte_rate, block_align, _ = struct.unpack_from('<HHIIHH', data, body)
+    elif chunk_id == b'data':
+      if not byte_rate or not block_align:
+        return None
+      return WavLayout(data_offset=body, data_size=size, byte_rate=byte_rate, block_align=block_align)
+
+    pos = body + size + (size & 1)  # Chunks are padded to an even size
+
+  return None
+
+
+def trim_wav(data: bytes, max_seconds: float) -> Optional[bytes]:
+  # Cuts `data` after `max_seconds` of samples (or its last whole sample frame) and rewrites the RIFF and
+  # data chunk sizes to match; None if it isn't a WAV file
+  layout = wav_layout(data)
+  if layout is None:
+    return None
+
+  end = min(layout.prefix_size(max_seconds), len(data))
+  end -= (end - layout.data_offset) % layout.block_align
+
+  out = bytearray(data[:end])
+  struct.pack_into('<I', out, 4, len(out) - 8)
+  struct.pack_into('<I', out, layout.data_offset - 4, end - layout.data_offset)
+  return bytes(out)
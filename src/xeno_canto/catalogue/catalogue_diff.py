@@ -0,0 +1,58 @@
+from xeno_canto.recording.recording_schema import XenoCantoRecordingSchema
+
+from dataclasses import dataclass, field
+from typing import (
+  Any,
+  Dict,
+  List,
+  Tuple,
+)
+import hashlib
+import json
+
+FieldChange = Tuple[Any, Any]  # (old, new), as normalized JSON values
+
+
+def normalize_record(r: XenoCantoRecordingSchema) -> Dict[str, Any]:
+  # JSON-mode dump: URLs, dates and enums become plain values, so equal records normalize identically
+  return r.model_dump(mode='json', exclude_computed_fields=True)
+
+
+def canonical_json(data: Dict[str, Any]) -> str:
+  return json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+def content_hash(data: Dict[str, Any]) -> str:
+  return hashlib.blake2b(canonical_json(data).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def diff_fields(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, FieldChange]:
+  return {k: (old.get(k), new.get(k)) for k in sorted(old.keys() | new.keys()) if old.get(k) != new.get(k)}
+
+
+@dataclass(frozen=True)
+class RecordChange:
+  number: int
+  fields: Dict[str, FieldChange]
+
+
+@dataclass
+class RecordDiff:
+  added: List[int] = field(default_factory=list)
+  changed: List[RecordChange] = field(default_factory=list)
+  removed: List[int] = field(default_factory=list)
+  unchanged: int = 0
+
+  def __bool__(self) -> bool:
+    return bool(self.added or self.changed or self.removed)
+
+  @property
+  def touched(self) -> List[int]:
+    # Catalogue numbers whose stored content differs after the sync, for incremental downstream jobs
+    return sorted([*self.added, *(c.number for c in self.changed), *self.removed])
+
+  def extend(self, other: 'RecordDiff') -> None:
+    self.added.extend(other.added)
+    self.changed.extend(other.changed)
+    self.removed.extend(other.removed)
+    self.unchanged += other.unchanged
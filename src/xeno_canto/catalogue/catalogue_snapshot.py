@@ -0,0 +1,226 @@
+from xeno_canto.audio.audio_backend import require
+from xeno_canto.catalogue.catalogue_diff import canonical_json
+from xeno_canto.catalogue.catalogue_store import RecordStore
+from xeno_canto.recording.recording import XenoCantoRecording
+from xeno_canto.recording.recording_schema import XenoCantoRecordingSchema
+
+from pathlib import Path
+from typing import (
+  Any,
+  Callable,
+  Dict,
+  Iterator,
+  List,
+  Optional,
+  Tuple,
+  Union,
+)
+from pydantic import TypeAdapter
+from itertools import islice
+import datetime
+import json
+import os
+import shutil
+
+_META_FILE = 'snapshot.json'
+_ROWS_FILE = 'records.bin'
+_OFFSETS_FILE = 'records.offsets.npy'
+_VERSION = 1
+
+_TIMEDELTA = TypeAdapter(datetime.timedelta)
+
+
+def _seconds(v: Any) -> int:
+  return -1 if v is None else int(_TIMEDELTA.validate_python(v).total_seconds())
+
+
+def _number(v: Any) -> float:
+  return float('nan') if v is None else float(v)
+
+
+# (column, kind, dtype, converter from the normalized JSON value); missing values are NaN, NaT, -1 or 0
+COLUMNS: Tuple[Tuple[str, str, str, Callable[[Any], Any]], ...] = (
+  ('number', 'numeric', '<u4', int),
+  ('latitude', 'numeric', '<f8', _number),
+  ('longitude', 'numeric', '<f8', _number),
+  ('altitude', 'numeric', '<f4', _number),
+  ('temp', 'numeric', '<f4', _number),
+  ('length', 'numeric', '<i4', _seconds),  # Seconds
+  ('quality', 'numeric', '<i1', lambda v: 0 if v is None else int(v)),  # QualityRating value
+  ('sample_rate', 'numeric', '<i4', lambda v: -1 if v is None else int(v)),
+  ('date', 'numeric', '<M8[D]', lambda v: v),
+  ('upload_date', 'numeric', '<M8[D]', lambda v: v),
+  ('group', 'category', '<i4', lambda v: v),
+  ('genus', 'category', '<i4', lambda v: v),
+  ('epithet', 'category', '<i4', lambda v: v),
+  ('subspecies', 'category', '<i4', lambda v: v),
+  ('common_name', 'category', '<i4', lambda v: v),
+  ('recordist', 'category', '<i4', lambda v: v),
+  ('country', 'category', '<i4', lambda v: v),
+  ('method', 'category', '<i4', lambda v: v),
+)
+
+
+def _column_file(name: str, kind: str) -> str:
+  return f'{name}.codes.npy' if kind == 'category' else f'{name}.npy'
+
+
+def write_snapshot(store: RecordStore, root: Union[str, Path], batch_size: int = 1000) -> 'Snapshot':
+  np = require('numpy', extra='dataframe')
+
+  root = Path(root)
+  tmp = root.with_name(root.name + '.tmp')
+  shutil.rmtree(tmp, ignore_errors=True)
+  tmp.mkdir(parents=True)
+
+  # Columns are typed arrays sized from the store and filled one batch at a time, so only one batch of records is
+  # held as Python objects. Records synced while the snapshot is taken grow the arrays
+  capacity = len(store)
+  arrays: Dict[str, Any] = {name: np.empty(capacity, dtype=dtype) for name, _, dtype, _ in COLUMNS}
+  dictionaries: Dict[str, Dict[str, int]] = {name: {} for name, kind, _, _ in COLUMNS if kind == 'category'}
+  offsets = np.zeros(capacity + 1, dtype='<u8')
+  count = 0
+
+  # Full rows are kept as canonical JSON in one blob, so a row is materialized from a single slice
+  records = store.iter_normalized(batch_size)
+  with (tmp / _ROWS_FILE).open('wb') as rows:
+    while batch := list(islice(records, batch_size)):
+      end = count + len(batch)
+      if end > capacity:
+        grow = max(end, 2 * capacity) - capacity
+        arrays = {name: np.concatenate([a, np.empty(grow, dtype=a.dtype)]) for name, a in arrays.items()}
+        offsets = np.concatenate([offsets, np.zeros(grow, dtype=offsets.dtype)])
+        capacity += grow
+
+      for name, kind, _, convert in COLUMNS:
+        values = [convert(data.get(name)) for data in batch]
+        if kind == 'category':
+          index = dictionaries[name]
+          values = [-1 if v is None else index.setdefault(v, len(index)) for v in values]
+        arrays[name][count:end] = values
+
+      blobs = [canonical_json(data).encode('utf-8') for data in batch]
+      rows.write(b''.join(blobs))
+      offsets[count + 1 : end + 1] = offsets[count] + np.cumsum([len(b) for b in blobs], dtype='<u8')
+      count = end
+
+  columns = {}
+  for name, kind, dtype, _ in COLUMNS:
+    np.save(tmp / _column_file(name, kind), arrays[name][:count])
+    columns[name] = dict(kind=kind, dtype=dtype)
+    if kind == 'category':
+      columns[name]['categories'] = sorted(dictionaries[name], key=dictionaries[name].__getitem__)
+  np.save(tmp / _OFFSETS_FILE, offsets[: count + 1])
+
+  meta = dict(version=_VERSION, count=count, columns=columns)
+  (tmp / _META_FILE).write_text(json.dumps(meta), encoding='utf-8')
+
+  # Swap directories so readers never see a half-written snapshot
+  old = root.with_name(root.name + '.old')
+  if root.exists():
+    shutil.rmtree(old, ignore_errors=True)
+    os.replace(root, old)
+  os.replace(tmp, root)
+  shutil.rmtree(old, ignore_errors=True)
+
+  return Snapshot(root)
+
+
+class Snapshot:
+  # NOTE Opening reads only the small metadata file; columns and rows are memory-mapped on first use
+  def __init__(self, root: Union[str, Path]):
+    self._np = require('numpy', extra='dataframe')
+    self._root = Path(root)
+
+    meta = json.loads((self._root / _META_FILE).read_text(encoding='utf-8'))
+    if meta.get('version') != _VERSION:
+      raise ValueError(f'Unsupported snapshot version: {meta.get("version")}')
+
+    self._count: int = meta['count']
+    self._columns: Dict[str, Dict[str, Any]] = meta['columns']
+    self._arrays: Dict[str, Any] = {}
+    self._category_index: Dict[str, Dict[str, int]] = {}
+    self._rows: Optional[Any] = None
+
+  def __len__(self) -> int:
+    return self._count
+
+  @property
+  def columns(self) -> List[str]:
+    return list(self._columns)
+
+  def _array(self, file: str) -> Any:
+    if file not in self._arrays:
+      self._arrays[file] = self._np.load(self._root / file, mmap_mode='r')
+    return self._arrays[file]
+
+  def codes(self, name: str) -> Any:
+    if self._columns[name]['kind'] != 'category':
+      raise ValueError(f'{name} is not a category column')
+    return self._array(_column_file(name, 'category'))
+
+  def categories(self, name: str) -> List[str]:
+    return self._columns[name]['categories']
+
+  def column(self, name: str) -> Any:
+    # Numeric columns are zero-copy memory maps; category columns are decoded into an object array
+    spec = self._columns[name]
+    if spec['kind'] != 'category':
+      return self._array(_column_file(name, spec['kind']))
+
+    np = self._np
+    lookup = np.array([*spec['categories'], None], dtype=object)
+    return lookup[self.codes(name)]  # Code -1 picks the trailing None
+
+  def code_of(self, name: str, value: str) -> int:
+    if name not in self._category_index:
+      self._category_index[name] = {c: i for i, c in enumerate(self.categories(name))}
+    return self._category_index[name].get(value, -1)
+
+  def equals(self, name: str, value: str) -> Any:
+    # Boolean mask, computed on the codes without decoding the column
+    return self.codes(name) == self.code_of(name, value)
+
+  @property
+  def numbers(self) -> Any:
+    return self.column('number')
+
+  def index_of(self, number: int) -> Optional[int]:
+    i = int(self._np.searchsorted(self.numbers, number))
+    return i if i < self._count and int(self.numbers[i]) == number else None
+
+  def raw(self, i: int) -> Dict[str, Any]:
+    if not -self._count <= i < self._count:
+      raise IndexError(i)
+    i %= self._count
+
+    if self._rows is None:
+      self._rows = self._np.memmap(self._root / _ROWS_FILE, dtype='u1', mode='r')
+    offsets = self._array(_OFFSETS_FILE)
+    return json.loads(self._rows[int(offsets[i]) : int(offsets[i + 1])].tobytes())
+
+  def __getitem__(self, i: int) -> XenoCantoRecording:
+    return XenoCantoRecording.from_pydantic(XenoCantoRecordingSchema.model_validate(self.raw(i)))
+
+  def get(self, number: int) -> Optional[XenoCantoRecording]:
+    i = self.index_of(number)
+    return None if i is None else self[i]
+
+  def __iter__(self) -> Iterator[XenoCantoRecording]:
+    for i in range(self._count):
+      yield self[i]
+
+  def rows(self, indices: Any) -> Iterator[XenoCantoRecording]:
+    # e.g. snapshot.rows(np.flatnonzero(snapshot.equals('country', 'Spain')))
+    for i in indices:
+      yield self[int(i)]
+
+  def to_dataframe(self) -> Any:
+    pd = require('pandas', extra='dataframe')
+    data = {}
+    for name, spec in self._columns.items():
+      if spec['kind'] == 'category':
+        data[name] = pd.Categorical.from_codes(self.codes(name), categories=spec['categories'])
+      else:
+        data[name] = self.column(name)
+    return pd.DataFrame(data, copy=False)
@@ -0,0 +1,182 @@
+from xeno_canto.audio.audio_backend import require
+from xeno_canto.tags.tags import BoxTag
+
+from typing import (
+  Any,
+  Iterable,
+  List,
+  Optional,
+  Tuple,
+  Union,
+)
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+_HALF_CIRCUMFERENCE_KM = math.pi * EARTH_RADIUS_KM
+
+# (lat_min, lon_min, lat_max, lon_max), as in box:LAT_MIN,LON_MIN,LAT_MAX,LON_MAX
+Box = Tuple[float, float, float, float]
+
+
+def _as_box(box: Union[BoxTag, Box]) -> Box:
+  if isinstance(box, BoxTag):
+    return box.ay, box.ax, box.by, box.bx
+  return box
+
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+  lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+  a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+  return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, max(0.0, a))))
+
+
+def haversine_km(lat1: Any, lon1: Any, lat2: Any, lon2: Any) -> Any:
+  # Vectorized distance_km
+  np = require('numpy', extra='dataframe')
+  lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+  a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+  return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _outward(lo: float, hi: float, digits: int = 4) -> Tuple[float, float]:
+  # Rounded outwards (1e-4 degrees is about 11 m) so box: queries stay short and covering
+  scale = 10**digits
+  return math.floor(lo * scale) / scale, math.ceil(hi * scale) / scale
+
+
+def radius_boxes(lat: float, lon: float, radius_km: float) -> List[BoxTag]:
+  # Smallest lat/lon boxes covering the circle; two boxes when it crosses the antimeridian,
+  # one full-longitude band when it contains a pole
+  if radius_km < 0:
+    raise ValueError(radius_km)
+
+  boxes = []
+  for b in _radius_boxes(lat, lon, radius_km):
+    (ay, by), (ax, bx) = _outward(b.ay, b.by), _outward(b.ax, b.bx)
+    boxes.append(BoxTag(max(ay, -90.0), max(ax, -180.0), min(by, 90.0), min(bx, 180.0)))
+  return boxes
+
+
+def _radius_boxes(lat: float, lon: float, radius_km: float) -> List[BoxTag]:
+  angular = radius_km / EARTH_RADIUS_KM
+  dlat = math.degrees(angular)
+  lat_min, lat_max = lat - dlat, lat + dlat
+
+  if lat_max >= 90 or lat_min <= -90 or angular >= math.pi / 2:
+    return [BoxTag(max(lat_min, -90.0), -180.0, min(lat_max, 90.0), 180.0)]
+
+  # Longitude half-width of the circle's bounding box at its widest latitude
+  dlon = math.degrees(math.asin(min(1.0, math.sin(angular) / math.cos(math.radians(lat)))))
+  lon_min, lon_max = lon - dlon, lon + dlon
+
+  if lon_min < -180:
+    return [BoxTag(lat_min, lon_min + 360, lat_max, 180.0), BoxTag(lat_min, -180.0, lat_max, lon_max)]
+  if lon_max > 180:
+    return [BoxTag(lat_min, lon_min, lat_max, 180.0), BoxTag(lat_min, -180.0, lat_max, lon_max - 360)]
+  return [BoxTag(lat_min, lon_min, lat_max, lon_max)]
+
+
+class SpatialIndex:
+  # NOTE Points are sorted by grid cell (row-major), so the cells of one grid row that overlap a box
+  # form a single contiguous key range: a box query costs two binary searches per row it spans
+  def __init__(self, numbers: Any, latitudes: Any, longitudes: Any, cell_degrees: float = 1.0):
+    np = self._np = require('numpy', extra='dataframe')
+
+    lat = np.asarray(latitudes, dtype=np.float64)
+    lon = np.asarray(longitudes, dtype=np.float64)
+    keep = ~(np.isnan(lat) | np.isnan(lon))
+
+    self.cell_degrees = cell_degrees
+    self._n_cols = int(math.ceil(360 / cell_degrees))
+    self._n_rows = int(math.ceil(180 / cell_degrees))
+
+    keys = self._keys(lat[keep], lon[keep])
+    order = np.argsort(keys, kind='stable')
+    self._keys_sorted = keys[order]
+    self.numbers = np.asarray(numbers)[keep][order]
+    self.latitudes = lat[keep][order]
+    self.longitudes = lon[keep][order]
+
+  @classmethod
+  def from_records(cls, records: Iterable[Any], cell_degrees: float = 1.0) -> 'SpatialIndex':
+    numbers, lats, lons = [], [], []
+    for r in records:
+      numbers.append(int(r.number))
+      lats.append(float('nan') if r.latitude is None else r.latitude)
+      lons.append(float('nan') if r.longitude is None else r.longitude)
+    return cls(numbers, lats, lons, cell_degrees)
+
+  @classmethod
+  def from_snapshot(cls, snapshot: Any, cell_degrees: float = 1.0) -> 'SpatialIndex':
+    return cls(snapshot.numbers, snapshot.column('latitude'), snapshot.column('longitude'), cell_degrees)
+
+  def __len__(self) -> int:
+    return len(self.numbers)
+
+  def _row(self, lat: Any) -> Any:
+    return self._np.clip(((lat + 90) // self.cell_degrees).astype(int), 0, self._n_rows - 1)
+
+  def _col(self, lon: Any) -> Any:
+    return self._np.clip(((lon + 180) // self.cell_degrees).astype(int), 0, self._n_cols - 1)
+
+  def _keys(self, lat: Any, lon: Any) -> Any:
+    return self._row(lat) * self._n_cols + self._col(lon)
+
+  def _candidates(self, box: Box) -> Any:
+    np = self._np
+    lat_min, lon_min, lat_max, lon_max = box
+    r0, r1 = (int(v) for v in self._row(np.array([lat_min, lat_max])))
+    c0, c1 = (int(v) for v in self._col(np.array([lon_min, lon_max])))
+
+    rows = np.arange(r0, r1 + 1) * self._n_cols
+    starts = np.searchsorted(self._keys_sorted, rows + c0, side='left')
+    stops = np.searchsorted(self._keys_sorted, rows + c1, side='right')
+    if not len(starts):
+      return np.empty(0, dtype=np.int64)
+    return np.concatenate([np.arange(a, b) for a, b in zip(starts, stops)])
+
+  def _in_box(self, box: Box) -> Any:
+    lat_min, lon_min, lat_max, lon_max = box
+    if lon_min > lon_max:
+      # Wraps across the antimeridian
+      return self._np.concatenate(
+        [self._in_box((lat_min, lon_min, lat_max, 180.0)), self._in_box((lat_min, -180.0, lat_max, lon_max))]
+      )
+
+    idx = self._candidates(box)
+    lat, lon = self.latitudes[idx], self.longitudes[idx]
+    return idx[(lat >= lat_min) & (lat <= lat_max) & (lon >= lon_min) & (lon <= lon_max)]
+
+  def box(self, box: Union[BoxTag, Box]) -> Any:
+    # Catalogue numbers inside the box, edges included
+    return self._np.sort(self.numbers[self._in_box(_as_box(box))])
+
+  def _within(self, lat: float, lon: float, radius_km: float) -> Tuple[Any, Any]:
+    np = self._np
+    idx = np.unique(np.concatenate([self._in_box(_as_box(b)) for b in radius_boxes(lat, lon, radius_km)]))
+    dist = haversine_km(lat, lon, self.latitudes[idx], self.longitudes[idx])
+    hit = dist <= radius_km
+    idx, dist = idx[hit], dist[hit]
+    order = np.argsort(dist, kind='stable')
+    return idx[order], dist[order]
+
+  def radius(self, lat: float, lon: float, radius_km: float) -> Tuple[Any, Any]:
+    # (catalogue numbers, distances in km), nearest first
+    idx, dist = self._within(lat, lon, radius_km)
+    return self.numbers[idx], dist
+
+  def nearest(self, lat: float, lon: float, k: int = 1, max_km: Optional[float] = None) -> Tuple[Any, Any]:
+    # Radius queries over a doubling radius; once one returns k points, they are the exact k nearest
+    if k < 1:
+      raise ValueError(k)
+
+    limit = _HALF_CIRCUMFERENCE_KM if max_km is None else max_km
+    radius_km = min(limit, self.cell_degrees * 111.2)
+    while True:
+      idx, dist = self._within(lat, lon, radius_km)
+      if len(idx) >= k or radius_km >= limit:
+        return self.numbers[idx[:k]], dist[:k]
+      radius_km = min(limit, radius_km * 2)
+
+  def nearest_many(self, points: Iterable[Tuple[float, float]], k: int = 1) -> List[Tuple[Any, Any]]:
+    return [self.nearest(lat, lon, k) for lat, lon in points]
@@ -0,0 +1,164 @@
+from xeno_canto.recording.recording_schema import XenoCantoRecordingSchema
+from xeno_canto.catalogue.catalogue_diff import (
+  RecordChange,
+  RecordDiff,
+  canonical_json,
+  content_hash,
+  diff_fields,
+  normalize_record,
+)
+
+from pathlib import Path
+from typing import (
+  Dict,
+  Iterable,
+  Iterator,
+  List,
+  Optional,
+  Tuple,
+  Union,
+)
+import json
+import sqlite3
+import threading
+import time
+
+IdRange = Tuple[int, int]
+
+_SQLITE_MAX_VARIABLES = 900
+
+
+class RecordStore:
+  # NOTE Records are kept as normalized JSON with a content hash; `sync` compares hashes first and only
+  # decodes the stored JSON of records whose hash changed
+  def __init__(self, path: Union[str, Path]):
+    self._path = Path(path)
+    self._lock = threading.RLock()
+    self._con = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None)
+    self._con.execute('PRAGMA journal_mode=WAL')
+    self._con.execute(
+      'CREATE TABLE IF NOT EXISTS records ('
+      '  number INTEGER PRIMARY KEY,'
+      '  hash TEXT NOT NULL,'
+      '  data TEXT NOT NULL,'
+      '  updated REAL NOT NULL'
+      ')'
+    )
+
+  @property
+  def path(self) -> Path:
+    return self._path
+
+  def _stored(self, numbers: List[int]) -> Dict[int, Tuple[str, str]]:
+    stored: Dict[int, Tuple[str, str]] = {}
+    for i in range(0, len(numbers), _SQLITE_MAX_VARIABLES):
+      chunk = numbers[i : i + _SQLITE_MAX_VARIABLES]
+      marks = ','.join('?' * len(chunk))
+      for number, h, data in self._con.execute(
+        f'SELECT number, hash, data FROM records WHERE number IN ({marks})', chunk
+      ):
+        stored[number] = (h, data)
+    return stored
+
+  def sync(self, records: Iterable[XenoCantoRecordingSchema], scope: Optional[IdRange] = None) -> RecordDiff:
+    # With a scope, stored records inside the nr range that were not received are reported as removed
+    incoming: Dict[int, Tuple[str, Dict]] = {}
+    for r in records:
+      data = normalize_record(r)
+      incoming[int(r.number)] = (content_hash(data), data)
+
+    diff = RecordDiff()
+    now = time.time()
+
+    with self._lock:
+      stored = self._stored(sorted(incoming))
+      writes = []
+
+      for number in sorted(incoming):
+        h, data = incoming[number]
+        if number not in stored:
+          diff.added.append(number)
+        elif stored[number][0] != h:
+          diff.changed.append(RecordChange(number, diff_fields(json.loads(stored[number][1]), data)))
+        else:
+          diff.unchanged += 1
+          continue
+        writes.append((number, h, canonical_json(data), now))
+
+      if scope is not None:
+        a, b = scope
+        in_scope = self._con.execute('SELECT number FROM records WHERE number BETWEEN ? AND ?', (a, b))
+        diff.removed.extend(n for (n,) in in_scope if n not in incoming)
+
+      self._con.execute('BEGIN')
+      try:
+        self._con.executemany('INSERT OR REPLACE INTO records (number, hash, data, updated) VALUES (?,?,?,?)', writes)
+        self._con.executemany('DELETE FROM records WHERE number = ?', [(n,) for n in diff.removed])
+        self._con.execute('COMMIT')
+      except BaseException:
+        self._con.execute('ROLLBACK')
+        raise
+
+    return diff
+
+  def write(self, records: List[XenoCantoRecordingSchema]) -> None:
+    # RecordSink: upsert only, so partial writes (e.g. from `crawl`) never report removals
+    self.sync(records)
+
+  def content_hash(self, number: int) -> Optional[str]:
+    with self._lock:
+      row = self._con.execute('SELECT hash FROM records WHERE number = ?', (number,)).fetchone()
+    return row[0] if row else None
+
+  def get(self, number: int) -> Optional[XenoCantoRecordingSchema]:
+    with self._lock:
+      row = self._con.execute('SELECT data FROM records WHERE number = ?', (number,)).fetchone()
+    return XenoCantoRecordingSchema.model_validate(json.loads(row[0])) if row else None
+
+  def __getitem__(self, number: int) -> XenoCantoRecordingSchema:
+    r = self.get(number)
+    if r is None:
+      raise KeyError(number)
+    return r
+
+  def numbers(self) -> List[int]:
+    with self._lock:
+      return [n for (n,) in self._con.execute('SELECT number FROM records ORDER BY number')]
+
+  def iter_normalized(self, batch_size: int = 1000) -> Iterator[Dict]:
+    # Normalized JSON dicts in catalogue order, without building schema objects. Rows are read in keyset batches
+    # rather than from one open cursor, so the lock is held only per batch and writers can run between them
+    last = -1
+    while True:
+      with self._lock:
+        rows = self._con.execute(
+          'SELECT number, data FROM records WHERE number > ? ORDER BY number LIMIT ?', (last, batch_size)
+        ).fetchall()
+      for last, data in rows:
+        yield json.loads(data)
+      if len(rows) < batch_size:
+        return
+
+  def __iter__(self) -> Iterator[XenoCantoRecordingSchema]:
+    for data in self.iter_normalized():
+      yield XenoCantoRecordingSchema.model_validate(data)
+
+  def __len__(self) -> int:
+    with self._lock:
+      return self._con.execute('SELECT COUNT(*) FROM records').fetchone()[0]
+
+  def __contains__(self, number: object) -> bool:
+    if not isinstance(number, int):
+      return False
+    with self._lock:
+      return self._con.execute('SELECT 1 FROM records WHERE number = ?', (number,)).fetchone() is not None
+
+  def close(self) -> None:
+    with self._lock:
+      self._con.close()
+
+  def __enter__(self) -> 'RecordStore':
+    return self
+
+  def __exit__(self, *exc) -> None:
+    self.close()
@@ -0,0 +1,203 @@
+from xeno_canto.audio.audio_backend import require
+from xeno_canto.catalogue.catalogue_store import RecordStore
+from xeno_canto.query.query_params import XenoCantoQueryParams
+
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass
+from typing import (
+  Any,
+  Dict,
+  Iterable,
+  List,
+  Literal,
+  Mapping,
+  Optional,
+  Tuple,
+  Unpack,
+)
+
+TaxonField = Literal['genus', 'epithet', 'subspecies', 'common_name', 'species']  # species is 'Genus epithet'
+
+_FIELDS: Tuple[TaxonField, ...] = ('genus', 'epithet', 'subspecies', 'common_name', 'species')
+_QUERY_FIELDS: Tuple[TaxonField, ...] = ('genus', 'epithet', 'subspecies', 'common_name')
+
+
+@dataclass(frozen=True)
+class TaxonMatch:
+  name: str
+  count: int  # Stored recordings with this name
+
+
+def _key(name: str) -> str:
+  return ' '.join(name.split()).casefold()
+
+
+def _next_row(row: List[int], c: str, target: str) -> List[int]:
+  # One Levenshtein DP row: distances from the key prefix extended by `c` to every prefix of `target`
+  out = [row[0] + 1]
+  for j, t in enumerate(target, 1):
+    out.append(min(row[j] + 1, out[j - 1] + 1, row[j - 1] + (c != t)))
+  return out
+
+
+def _common_prefix(a: str, b: str) -> int:
+  n = 0
+  for x, y in zip(a, b):
+    if x != y:
+      break
+    n += 1
+  return n
+
+
+class _SortedNames:
+  # Case-folded keys in sorted order, so a prefix is one contiguous slice found by binary search
+  def __init__(self, counts: Mapping[str, int]):
+    merged: Dict[str, Counter] = {}
+    for name, n in counts.items():
+      if name and n > 0:
+        merged.setdefault(_key(name), Counter())[' '.join(name.split())] += n
+
+    self.keys = sorted(merged)
+    # Spellings that differ only in case are one entry, shown as the most common spelling
+    self.names = [merged[k].most_common(1)[0][0] for k in self.keys]
+    self.counts = [sum(merged[k].values()) for k in self.keys]
+
+  def __len__(self) -> int:
+    return len(self.keys)
+
+  def span(self, prefix: str) -> Tuple[int, int]:
+    prefix = _key(prefix)
+    start = bisect_left(self.keys, prefix)
+    # Every key starting with `prefix` sorts below prefix + the largest code point
+    return start, bisect_left(self.keys, prefix + '\U0010ffff', start)
+
+  def find(self, name: str) -> Optional[int]:
+    key = _key(name)
+    i = bisect_left(self.keys, key)
+    return i if i < len(self.keys) and self.keys[i] == key else None
+
+  def near(self, text: str, limit: int) -> List[Tuple[int, int]]:
+    # (distance, index) of keys within `limit` edits. Neighbouring keys share prefixes, so DP rows are
+    # reused like a trie walk, and a prefix whose row already exceeds `limit` skips its whole slice
+    target = _key(text)
+    rows = [list(range(len(target) + 1))]
+    prev, i, out = '', 0, []
+    while i < len(self.keys):
+      k = self.keys[i]
+      del rows[min(_common_prefix(prev, k), len(rows) - 1) + 1 :]
+      prev = k
+      for depth in range(len(rows) - 1, len(k)):
+        rows.append(_next_row(rows[-1], k[depth], target))
+        if min(rows[-1]) > limit:
+          i = bisect_left(self.keys, k[: depth + 1] + '\U0010ffff', i)
+          break
+      else:
+        if rows[-1][-1] <= limit:
+          out.append((rows[-1][-1], i))
+        i += 1
+    return out
+
+  def match(self, i: int) -> TaxonMatch:
+    return TaxonMatch(self.names[i], self.counts[i])
+
+
+class TaxonomyIndex:
+  # NOTE Matching mirrors the API's gen:/sp:/ssp:/en: tags: case-insensitive "starts with"
+  def __init__(self, counts: Mapping[TaxonField, Mapping[str, int]]):
+    self._names: Dict[TaxonField, _SortedNames] = {f: _SortedNames(counts.get(f, {})) for f in _FIELDS}
+
+  @classmethod
+  def from_values(cls, rows: Iterable[Tuple[Any, Any, Any, Any]]) -> 'TaxonomyIndex':
+    # rows of (genus, epithet, subspecies, common_name)
+    counts: Dict[TaxonField, Counter] = {f: Counter() for f in _FIELDS}
+    for genus, epithet, subspecies, common_name in rows:
+      counts['genus'][genus] += 1
+      counts['epithet'][epithet] += 1
+      counts['subspecies'][subspecies] += 1
+      counts['common_name'][common_name] += 1
+      if genus and epithet:
+        counts['species'][f'{genus} {epithet}'] += 1
+    return cls({f: {k: n for k, n in c.items() if k} for f, c in counts.items()})
+
+  @classmethod
+  def from_records(cls, records: Iterable[Any]) -> 'TaxonomyIndex':
+    return cls.from_values((r.genus, r.epithet, r.subspecies, r.common_name) for r in records)
+
+  @classmethod
+  def from_store(cls, store: RecordStore) -> 'TaxonomyIndex':
+    return cls.from_values(
+      (d.get('genus'), d.get('epithet'), d.get('subspecies'), d.get('common_name')) for d in store.iter_normalized()
+    )
+
+  @classmethod
+  def from_snapshot(cls, snapshot: Any) -> 'TaxonomyIndex':
+    # Counted on the dictionary codes, without decoding any column
+    np = require('numpy', extra='dataframe')
+
+    def tally(name: str) -> Tuple[Any, List[str]]:
+      codes, categories = snapshot.codes(name), snapshot.categories(name)
+      return np.bincount(codes[codes >= 0], minlength=len(categories)), categories
+
+    counts: Dict[TaxonField, Dict[str, int]] = {}
+    for f in _QUERY_FIELDS:
+      n, categories = tally(f)
+      counts[f] = {c: int(k) for c, k in zip(categories, n)}
+
+    genus, epithet = snapshot.codes('genus').astype(np.int64), snapshot.codes('epithet').astype(np.int64)
+    genera, epithets = snapshot.categories('genus'), snapshot.categories('epithet')
+    both = (genus >= 0) & (epithet >= 0)
+    pairs, n = np.unique(genus[both] * max(1, len(epithets)) + epithet[both], return_counts=True)
+    g, e = np.divmod(pairs, max(1, len(epithets)))
+    counts['species'] = {f'{genera[a]} {epithets[b]}': int(k) for a, b, k in zip(g, e, n)}
+
+    return cls(counts)
+
+  def __len__(self) -> int:
+    return len(self._names['species'])
+
+  def names(self, field: TaxonField) -> List[str]:
+    return list(self._names[field].names)
+
+  def count(self, field: TaxonField, name: str) -> int:
+    names = self._names[field]
+    i = names.find(name)
+    return 0 if i is None else names.counts[i]
+
+  def prefix_count(self, field: TaxonField, prefix: str) -> int:
+    # Recordings the equivalent API tag would match
+    start, stop = self._names[field].span(prefix)
+    return sum(self._names[field].counts[start:stop])
+
+  def prefix(self, field: TaxonField, prefix: str, limit: Optional[int] = 10) -> List[TaxonMatch]:
+    # Autocomplete: names starting with `prefix`, most recorded first
+    names = self._names[field]
+    start, stop = names.span(prefix)
+    hits = sorted(range(start, stop), key=lambda i: (-names.counts[i], names.keys[i]))
+    return [names.match(i) for i in hits[:limit]]
+
+  def suggest(self, field: TaxonField, text: str, max_distance: int = 2, limit: int = 5) -> List[TaxonMatch]:
+    # Closest names by edit distance, then by how often they were recorded
+    names = self._names[field]
+    scored = sorted((d, -names.counts[i], names.keys[i], i) for d, i in names.near(text, max_distance))
+    return [names.match(i) for *_, i in scored[:limit]]
+
+  def check(self, **kwargs: Unpack[XenoCantoQueryParams]) -> Dict[TaxonField, List[TaxonMatch]]:
+    # Taxonomy tags of a query that match no stored recording, each with suggestions; empty when the query can match
+    unknown: Dict[TaxonField, List[TaxonMatch]] = {}
+    for f in _QUERY_FIELDS:
+      value = kwargs.get(f)
+      if isinstance(value, str) and value.strip() and not self.prefix_count(f, value):
+        unknown[f] = self.suggest(f, value)
+
+    genus, epithet = kwargs.get('genus'), kwargs.get('epithet')
+    if isinstance(genus, str) and isinstance(epithet, str) and not unknown and not self._pair_exists(genus, epithet):
+      # Each name exists, but never together; fall back to the genus' most recorded species
+      unknown['species'] = self.suggest('species', f'{genus} {epithet}') or self.prefix('species', f'{genus} ', 5)
+    return unknown
+
+  def _pair_exists(self, genus: str, epithet: str) -> bool:
+    species = self._names['species']
+    start, stop = species.span(genus)
+    epithet = _key(epithet)
+    return any(k.partition(' ')[2].startswith(epithet) for k in species.keys[start:stop])
@@ -6,9 +6,15 @@ from xeno_canto.recording.recording import (
   XenoCantoRecording,
   XenoCantoRecordingLean,
 )
+from xeno_canto.audio.audio import (
+  XenoCantoAudio,
+)
 from xeno_canto.query.query_schema import (
   XenoCantoQuerySchema,
 )
+from xeno_canto.query.query_compiled import (
+  compile_query,
+)
 from xeno_canto.client.client_errors import (
   ClientError,
   ServerError,
@@ -27,9 +33,79 @@ from xeno_canto.client.client_types import (
   Query,
 )
 from xeno_canto.client.client_http import (
+  CachedLimiterSession,
   get_session,
   get_cached_limiter_session,
 )
+from xeno_canto.client.client_transport import (
+  Transport,
+  TransportConfig,
+)
+from xeno_canto.client.client_concurrency import (
+  ordered_map,
+  ordered_stream,
+)
+from xeno_canto.client.client_partition import QueryPartitioner
+from xeno_canto.client.client_estimates import (
+  QueryCount,
+  QueryEstimate,
+  mean_length,
+)
+from xeno_canto.client.client_crawler import (
+  CatalogueCrawler,
+  CrawlReport,
+  RecordSink,
+)
+from xeno_canto.client.client_cursor import (
+  SearchCursor,
+  SearchStream,
+)
+from xeno_canto.client.client_coverage import CoverageMap
+from xeno_canto.catalogue.catalogue_diff import RecordDiff
+from xeno_canto.catalogue.catalogue_store import RecordStore
+from xeno_canto.catalogue.catalogue_spatial import (
+  distance_km,
+  radius_boxes,
+)
+from xeno_canto.client.client_cache import (
+  CATALOGUE_HORIZON,
+  CacheConfig,
+  PageMemo,
+)
+from xeno_canto.download.download_layout import (
+  Grouping,
+  Naming,
+  ImageKind,
+  ImageSize,
+  master_dir,
+  group_dir,
+  file_name,
+  image_url,
+  image_name,
+  record_metadata,
+)
+from xeno_canto.download.download_stream import (
+  DEFAULT_CHUNK_SIZE,
+  ChunkSink,
+  iter_chunks,
+  feed,
+)
+from xeno_canto.download.download_store import (
+  LinkMode,
+  ObjectStore,
+)
+from xeno_canto.dataset.dataset_shards import ShardWriter
+from xeno_canto.dataset.dataset_frame import to_dataframe
+from xeno_canto.audio.audio_mp3 import (
+  first_frame,
+  id3v2_size,
+  trim_frames,
+)
+from xeno_canto.audio.audio_wav import (
+  trim_wav,
+  wav_layout,
+)
+from xeno_canto.query.query_params import XenoCantoQueryParams
 
 from typing import (
   Optional,
@@ -41,14 +117,15 @@ from typing import (
   Tuple,
   Set,
   Iterable,
-  Literal,
 )
+from functools import partial
+import threading
 import warnings
 import re
+from urllib.parse import urlencode
 from os import cpu_count
 import random
 from pathlib import Path
-from datetime import datetime
 from pydantic import (
   SecretStr,
 )
@@ -66,48 +143,112 @@ class Client:
   _SEARCH_LIMIT = 10000
   _USER_AGENT = 'Xeno-Canto-Client-py/1.0'
   _CACHE_NAME = '.xeno_cento_cache'
+  _RATE_PER_SECOND = 4
+  _RATE_BURST = 10
+  _ESTIMATED_BITRATE = 256_000  # bits per second; XC keeps original uploads, mostly 128-320 kbps MP3s
+  _RANGE_PROBE_SIZE = 1 << 14
+  _RANGE_MARGIN = 1.05  # Over-fetch factor for VBR files whose early frames are larger than average
 
   def __init__(
     self,
     api_key: Union[SecretStr, str],
     verbose: bool = False,
+    coverage: Optional[Union[str, Path]] = None,
+    coverage_ttl: timedelta = timedelta(days=30),
+    max_workers: Optional[int] = None,
+    transport: Optional[TransportConfig] = None,
+    session: Optional[Transport] = None,
+    cache: Optional[CacheConfig] = None,
   ):
     self._api_key = api_key.get_secret_value() if isinstance(api_key, SecretStr) else api_key
     self._verbose = verbose
-    self._download_session = get_session(user_agent=self._USER_AGENT)
-    self._recording_session = get_cached_limiter_session(
-      per_second=4,
-      burst=10,
-      ttl=timedelta(days=1),
+    self._coverage_path = Path(coverage) if coverage is not None else None
+    self._coverage: Optional[CoverageMap] = None
+    if self._coverage_path is not None:
+      self._coverage = CoverageMap.load(self._coverage_path, size=self._XC_MAX_ID, ttl=coverage_ttl)
+
+    self._max_workers = max_workers or min(4, cpu_count() or 1)
+    self._transport = transport or TransportConfig()
+    self._cache = cache or CacheConfig()
+    self._pages: PageMemo[XenoCantoResponseSchema] = PageMemo(self._cache.memo_size)
+    self._horizon_seeded = False
+    self._horizon_lock = threading.Lock()
+
+    # NOTE An injected session (e.g. an in-process fake) replaces both the API and the download sessions
+    self._download_session: Transport = session or get_session(
+      user_agent=self._USER_AGENT,
+      transport=self._transport,
+      max_workers=self._max_workers,
+    )
+    self._recording_session: Transport = session or get_cached_limiter_session(
+      per_second=self._RATE_PER_SECOND,
+      burst=self._RATE_BURST,
+      cache=self._cache,
       user_agent=self._USER_AGENT,
       cache_name=self._CACHE_NAME,
+      transport=self._transport,
+      max_workers=self._max_workers,
     )
-    self._max_workers = min(4, cpu_count() or 1)
-
-  def _prepare_url(self, query: Query):
-    if isinstance(query, XenoCantoQuerySchema):
-      query = query.model_dump(
-        exclude_none=True,
-        exclude_computed_fields=True,
+    # Per-request cache options only exist on the cached session; injected transports get plain `get` calls
+    self._cached_session = isinstance(self._recording_session, CachedLimiterSession)
+    self._base_url = f'{self._XC_API_BASE_URL}/recordings?' + urlencode(
+      dict(
+        key=self._api_key,
+        per_page=self._XC_MAX_PAGE_SIZE,
       )
+    )
 
-    query_string = '+'.join(f'{k}:{v}' for k, v in query.items())
+  def _prepare_url(self, query: Query) -> str:
+    compiled = compile_query(query)
+    return f'{self._base_url}&query={compiled.encoded}'
 
-    params = dict(
-      key=self._api_key,
-      per_page=self._XC_MAX_PAGE_SIZE,
-      query=query_string,
-    )
+  def _ttl(self, query: Query) -> Optional[timedelta]:
+    if self._cache.policy is None:
+      return None
+
+    compiled = compile_query(query)
+    if compiled.get('nr') is not None and not CATALOGUE_HORIZON.known:
+      self._seed_horizon()
+    return self._cache.policy.ttl(compiled)
+
+  def _seed_horizon(self) -> None:
+    # Recent uploads carry the newest catalogue numbers; tried once per client, and the page is cached for an hour.
+    # Workers racing here while the probe runs see an unknown horizon, which only shortens their TTL
+    with self._horizon_lock:
+      if self._horizon_seeded:
+        return
+      self._horizon_seeded = True
 
-    params_string = '&'.join(f'{k}={v}' for k, v in params.items())
+    try:
+      self._probe(XenoCantoQuerySchema.model_validate({'since': 1}))
+    except Exception as e:
+      if self._verbose:
+        print(f'Could not determine the newest catalogue number: {e}')
 
-    return f'{self._XC_API_BASE_URL}/recordings?{params_string}'
+  def _observe_newest(self, page: XenoCantoResponseSchema) -> None:
+    numbers = [int(r['id']) for r in page.recordings or () if str(r.get('id', '')).isdigit()]
+    if numbers:
+      CATALOGUE_HORIZON.observe(max(numbers))
 
-  def _fetch_from_api(self, url: str, page: int) -> XenoCantoResponseSchema:
+  def _fetch_from_api(
+    self,
+    url: str,
+    page: int,
+    ttl: Optional[timedelta] = None,
+    refresh: bool = False,
+  ) -> XenoCantoResponseSchema:
     if page < 1:
       raise ValueError(page)
 
-    resp = self._recording_session.get(f'{url}&page={page}')
+    # NOTE A per-request expiry overrides the session's default TTL for pages written to the cache;
+    # `refresh` revalidates a cached page with the server even if it has not expired
+    kwargs: dict = {}
+    if self._cached_session:
+      if ttl is not None:
+        kwargs['expire_after'] = ttl
+      if refresh:
+        kwargs['refresh'] = True
+    resp = self._recording_session.get(f'{url}&page={page}', **kwargs)
 
     match resp.status_code:
       case 401:
@@ -132,55 +273,108 @@ class Client:
         ) from None
 
     resp.raise_for_status()
-    return XenoCantoResponseSchema.model_construct(**resp.json())
+    page = self._pages.get_or_parse(resp, lambda r: XenoCantoResponseSchema.model_construct(**r.json()))
+    self._observe_newest(page)
+    return page
 
-  def _search(self, query: Query, limit: Optional[int] = None) -> Iterator[XenoCantoRecordingSchema]:
+  def _search_positions(
+    self,
+    query: Query,
+    limit: Optional[int] = None,
+    start_page: int = 1,
+    start_offset: int = 0,
+    refresh: bool = False,
+  ) -> Iterator[Tuple[int, int, XenoCantoRecordingSchema]]:
     if limit is not None and not (1 <= limit <= self._SEARCH_LIMIT):
       raise ValueError(limit)
 
-    # 1. Probe Page 1 (ResponseSchema now contains List[dict])
-    url = self._prepare_url(query)
-    probe = self._fetch_from_api(url, page=1)
-    if not probe.recordings:
+    # 1. Probe the first page (ResponseSchema contains List[dict]); it also reports the page count
+    compiled = compile_query(query)
+    url = self._prepare_url(compiled)
+    ttl = self._ttl(compiled)
+    resp = self._fetch_from_api(url, page=start_page, ttl=ttl, refresh=refresh)
+    if not resp.recordings:
       return
 
     yielded_count = 0
+    total_pages = int(resp.num_pages)
+    current_page = start_page
 
-    for raw_record in probe.recordings:
-      try:
-        yield XenoCantoRecordingSchema.model_validate(raw_record)
-        yielded_count += 1
-      except Exception as e:
-        if self._verbose:
-          print(f'Skipping malformed record on page 1: {e}')
-        continue
-
-      if limit and yielded_count >= limit:
-        return
-
-    # 3. Handle subsequent pages sequentially
-    total_pages = probe.num_pages
-    current_page = 2
-
-    while current_page <= total_pages:
-      resp = self._fetch_from_api(url, current_page)
-
-      if not resp or not resp.recordings:
-        break
+    # 2. Handle pages sequentially; offsets index the raw page, so positions stay stable across runs
+    while True:
+      for offset, raw_record in enumerate(resp.recordings):
+        if current_page == start_page and offset < start_offset:
+          continue
 
-      for raw_record in resp.recordings:
         try:
-          yield XenoCantoRecordingSchema.model_validate(raw_record)
-          yielded_count += 1
+          record = XenoCantoRecordingSchema.model_validate(raw_record)
         except Exception as e:
           if self._verbose:
-            print(f'Skipping malformed record on page {current_page}: {e}')
+            print(f'[{compiled.fingerprint}] Skipping malformed record on page {current_page}: {e}')
           continue
 
+        yield current_page, offset, record
+        yielded_count += 1
+
         if limit and yielded_count >= limit:
           return
 
       current_page += 1
+      if current_page > total_pages:
+        break
+
+      resp = self._fetch_from_api(url, current_page, ttl=ttl, refresh=refresh)
+      if not resp or not resp.recordings:
+        break
+
+  def _search(
+    self,
+    query: Query,
+    limit: Optional[int] = None,
+    refresh: bool = False,
+  ) -> Iterator[XenoCantoRecordingSchema]:
+    for _, _, record in self._search_positions(query, limit, refresh=refresh):
+      yield record
+
+  def _probe(self, query: Query) -> XenoCantoResponseSchema:
+    # NOTE The probe is page 1 of the query, so a subsequent search of the same query is served from cache
+    return self._fetch_from_api(self._prepare_url(query), page=1, ttl=self._ttl(query))
+
+  @staticmethod
+  def _count_from_probe(probe: XenoCantoResponseSchema) -> QueryCount:
+    # NOTE The API reports counts as strings
+    return QueryCount(
+      num_recordings=int(probe.num_recordings),
+      num_species=int(probe.num_species),
+      num_pages=int(probe.num_pages),
+    )
+
+  def _search_partitioned(self, query: Query, limit: Optional[int] = None) -> Iterator[XenoCantoRecordingSchema]:
+    if limit is not None and limit < 1:
+      raise ValueError(limit)
+
+    partitioner = QueryPartitioner(
+      probe=lambda q: self._count_from_probe(self._probe(q)).num_recordings,
+      cap=self._SEARCH_LIMIT,
+      id_range=(1, self._XC_MAX_ID),
+      max_workers=self._max_workers,
+    )
+    compiled = compile_query(query)
+    parts = partitioner.plan(compiled, limit)
+
+    if self._verbose:
+      print(f'[{compiled.fingerprint}] Partitioned into {len(parts)} sub-queries')
+
+    yielded_count = 0
+
+    # Sub-queries are disjoint nr ranges in ascending order, so the union needs no deduplication;
+    # each one streams through a page-sized buffer while the next ones are fetched
+    for r in ordered_stream(self._search, parts, self._max_workers, buffer=self._XC_MAX_PAGE_SIZE):
+      yield r
+      yielded_count += 1
+
+      if limit and yielded_count >= limit:
+        return
 
   @classmethod
   def _sanitize_rid(cls, rid: T.RecordingId) -> int:
@@ -225,49 +419,75 @@ class Client:
       f'Skipping invalid XC recording catalogue numbers - see https://xeno-canto.org/explore/api for more info; {malformed_str}'
     )
 
+  def _save_coverage(self) -> None:
+    if self._coverage is not None and self._coverage_path is not None:
+      self._coverage.save(self._coverage_path)
+
+  def _search_nr_range(self, start: int, end: int, refresh: bool = False) -> List[XenoCantoRecordingSchema]:
+    # A refresh asks the server even for ranges the coverage map holds as absent
+    if not refresh and self._coverage is not None and self._coverage.is_range_absent(start, end):
+      return []
+
+    recordings = list(self._search({'nr': f'{start}-{end}'}, refresh=refresh))
+
+    if self._coverage is not None:
+      received_ids = {int(r.number) for r in recordings}
+      self._coverage.mark_present(received_ids)
+      # NOTE Numbers above the newest one seen may still be assigned, so only gaps below it are absent
+      horizon = CATALOGUE_HORIZON()
+      self._coverage.mark_absent(rid for rid in range(start, end + 1) if rid not in received_ids and rid <= horizon)
+
+    return recordings
+
+  def _fetch_id_chunk(self, bounds: Tuple[int, int]) -> List[Tuple[int, Optional[XenoCantoRecordingSchema]]]:
+    i, j = bounds
+
+    try:
+      received = {int(r.number): r for r in self._search_nr_range(i, j)}
+
+    except Exception as e:
+      if self._verbose:
+        warnings.warn(f'Error fetching range {i}-{j}: {e}')
+      received = {}
+
+    return [(rid, received.get(rid)) for rid in range(i, j + 1)]
+
   def _search_id_range(
     self,
     start: int,
     end: int,
   ) -> Iterator[Tuple[int, Optional[XenoCantoRecordingSchema]]]:
     batch_size = self._XC_MAX_PAGE_SIZE
+    chunks = ((i, min(i + batch_size - 1, end)) for i in range(start, end + 1, batch_size))
 
-    for i in range(start, end + 1, batch_size):
-      j = min(i + batch_size - 1, end)
-      expected_ids = set(range(i, j + 1))
-      received_ids = set()
+    # Chunks are fetched concurrently but emitted in order; the reorder buffer holds at most 2 * max_workers chunks
+    for results in ordered_map(self._fetch_id_chunk, chunks, self._max_workers):
+      yield from results
 
-      try:
-        recordings = self._search({'nr': f'{i}-{j}'})
+  def _fetch_one_tracked(self, rid: int) -> Tuple[int, Optional[XenoCantoRecordingSchema]]:
+    if self._coverage is not None and self._coverage.is_absent(rid):
+      return rid, None
 
-        for r in recordings:
-          rid = int(r.number)
-          received_ids.add(rid)
-          yield rid, r
+    try:
+      res = self._fetch_one_by_id(rid)
 
-        missing_ids = expected_ids - received_ids
-        for mid in sorted(missing_ids):
-          yield mid, None
+    except Exception as e:
+      if self._verbose:
+        warnings.warn(f'Error fetching ID {rid}: {e}')
+      return rid, None
 
-      except Exception as e:
-        if self._verbose:
-          warnings.warn(f'Error fetching range {i}-{j}: {e}')
+    if self._coverage is not None:
+      if res is None:
+        if rid <= CATALOGUE_HORIZON():
+          self._coverage.mark_absent([rid])
+      else:
+        self._coverage.mark_present([rid])
 
-        for failed_id in sorted(expected_ids):
-          yield failed_id, None
+    return rid, res
 
   def _search_id_scattered(self, rids: List[int]) -> Iterator[Tuple[int, Optional[XenoCantoRecordingSchema]]]:
-    for rid in rids:
-      try:
-        res = self._fetch_one_by_id(rid)
-
-        yield rid, res
-
-      except Exception as e:
-        if self._verbose:
-          warnings.warn(f'Error fetching ID {rid}: {e}')
-
-        yield rid, None
+    # IDs are fetched concurrently and emitted in ascending order through a bounded reorder buffer
+    yield from ordered_map(self._fetch_one_tracked, sorted(set(rids)), self._max_workers)
 
   def _sample(self, k: int) -> List[XenoCantoRecordingSchema]:
     res: List[XenoCantoRecordingSchema] = []
@@ -278,9 +498,12 @@ class Client:
       batch_ids = []
       while len(batch_ids) < (needed * 2):
         rid = random.randint(1, self._XC_MAX_ID)
-        if rid not in seen:
+        if rid in seen:
+          continue
+
+        seen.add(rid)
+        if self._coverage is None or not self._coverage.is_absent(rid):
           batch_ids.append(rid)
-          seen.add(rid)
 
       for _, recording in self._search_id_scattered(batch_ids):  # _search_ids_scattered or _search_ids_range?
         if recording:
@@ -298,11 +521,95 @@ class Client:
     except StopIteration:
       return None
 
+  def _resolve_records(
+    self, recordings: Union[List[XenoCantoRecord], Iterator[XenoCantoRecord], List[int]]
+  ) -> List[XenoCantoRecord]:
+    rs_list: Union[List[XenoCantoRecord], List[int]] = list(recordings)
+
+    if not rs_list:
+      return []
+
+    if isinstance(rs_list[0], int):
+      fetched = self._search_id_scattered(rs_list)  # type: ignore
+      return [r for _, r in fetched if r is not None]
+
+    return rs_list  # type: ignore
+
   def _download_promise(self, file_dl: str) -> bytes:
     resp = self._download_session.get(file_dl)
     resp.raise_for_status()
     return resp.content
 
+  def _download_stream(self, file_dl: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[memoryview]:
+    resp = self._download_session.get(file_dl, stream=True)
+    resp.raise_for_status()
+    # Undo any Content-Encoding, so sinks receive the file's own bytes
+    resp.raw.decode_content = True
+    return iter_chunks(resp, chunk_size)
+
+  def _download_to_path(self, file_dl: str, path: Path) -> int:
+    tmp = path.with_name(path.name + '.part')
+    with tmp.open('wb') as f:
+      n = feed(self._download_stream(file_dl), f)
+    tmp.replace(path)
+    return n
+
+  def _download_prefix(self, file_dl: str, length: Optional[timedelta], max_seconds: float) -> bytes:
+    if max_seconds <= 0:
+      raise ValueError(max_seconds)
+
+    if not length or max_seconds >= length.total_seconds():
+      return self._download_promise(file_dl)
+
+    # 1. Probe the head of the file: it holds the format header, and the response reports the total size
+    resp = self._download_session.get(file_dl, headers={'Range': f'bytes=0-{self._RANGE_PROBE_SIZE - 1}'})
+    resp.raise_for_status()
+    data = resp.content
+
+    wav = wav_layout(data)
+    trim = trim_wav if wav is not None else trim_frames
+
+    if resp.status_code != 206:
+      # The server ignored the Range header and sent the whole file
+      trimmed = trim(data, max_seconds)
+      return data if trimmed is None else trimmed
+
+    # An ID3v2 tag longer than the probe (e.g. cover art) hides the first frame, but only precedes MPEG audio
+    offset = id3v2_size(data)
+    is_mpeg = wav is None and (offset >= len(data) or first_frame(data) is not None)
+    total = self._range_total(resp)
+
+    if total is None or (wav is None and not is_mpeg):
+      # Without the size or a known format there is no byte offset to estimate
+      return self._download_promise(file_dl)
+
+    # 2. Fetch up to the byte offset of `max_seconds`: exact for WAV, estimated from the mean byte rate for MPEG
+    if wav is not None:
+      end = min(total, wav.prefix_size(max_seconds))
+    else:
+      ratio = max_seconds / length.total_seconds()
+      end = min(total, offset + int((total - offset) * ratio * self._RANGE_MARGIN) + self._RANGE_PROBE_SIZE)
+
+    if len(data) < end:
+      resp = self._download_session.get(file_dl, headers={'Range': f'bytes={len(data)}-{end - 1}'})
+      resp.raise_for_status()
+      data += resp.content
+
+    # 3. Cut on a frame boundary
+    trimmed = trim(data, max_seconds)
+    return self._download_promise(file_dl) if trimmed is None else trimmed
+
+  @staticmethod
+  def _range_total(resp: Any) -> Optional[int]:
+    # Total size from 'Content-Range: bytes a-b/total'; None when the server reports it as unknown ('*')
+    total = resp.headers.get('Content-Range', '').rpartition('/')[2].strip()
+    return int(total) if total.isdigit() else None
+
+  def _fetch_audio(self, r: XenoCantoRecord, max_seconds: Optional[float] = None) -> bytes:
+    if max_seconds is None:
+      return self._download_promise(str(r.file_download))
+    return self._download_prefix(str(r.file_download), r.length, max_seconds)
+
   def _map(self, rs: Iterable[XenoCantoRecordingSchema], mode: ReturnMode, lean: bool = False) -> Iterator[AnyRecord]:
     match (mode, lean):
       case ('dataclass', True):
@@ -315,6 +622,14 @@ class Client:
       case ('dict', False):
         yield from (r.model_dump(mode='python') for r in rs)
 
+      case ('audio', True):
+        yield from (XenoCantoAudio(XenoCantoRecordingLean.from_pydantic(r), self._fetch_audio) for r in rs)
+      case ('audio', False):
+        yield from (XenoCantoAudio(XenoCantoRecording.from_pydantic(r), self._fetch_audio) for r in rs)
+
+      case ('dataframe', _):
+        raise ValueError("mode='dataframe' is only supported by search; use to_dataframe() on the records instead")
+
       case _:
         raise ValueError(mode)
 
@@ -326,15 +641,79 @@ class Client:
     lean = kwargs.pop('lean', False)
     stream = kwargs.pop('stream', False)
     cached = kwargs.pop('cached', False)
+    partition = kwargs.pop('partition', False)
+    resume = kwargs.pop('resume', None)
 
     query = XenoCantoQuerySchema.model_validate(kwargs)
 
-    rs = self._search(query, limit)
+    if partition:
+      if resume is not None:
+        raise ValueError('Resuming a partitioned search is not supported')
+
+      if mode == 'dataframe':
+        return to_dataframe(self._search_partitioned(query, limit), lean)
+
+      it = self._map(self._search_partitioned(query, limit), mode, lean)
+      return it if stream else list(it)
+
+    compiled = compile_query(query)
+    cursor = SearchCursor(fingerprint=compiled.fingerprint, page=1, offset=0)
+
+    if resume is not None:
+      cursor = SearchCursor.from_token(resume) if isinstance(resume, str) else resume
+      if cursor.fingerprint != compiled.fingerprint:
+        raise ValueError('Resume cursor was issued for a different query')
+
+    positions = self._search_positions(compiled, limit, start_page=cursor.page, start_offset=cursor.offset)
 
-    it = self._map(rs, mode, lean)
+    # NOTE Columns are filled straight from the validated schemas, without per-record dicts or objects
+    if mode == 'dataframe':
+      return to_dataframe((r for _, _, r in positions), lean)
+
+    it = SearchStream(positions, lambda r: next(self._map([r], mode, lean)), cursor)
 
     return it if stream else list(it)
 
+  def search_radius(
+    self,
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+    **kwargs: Unpack[SearchQueryParams],
+  ) -> Union[Iterator[AnyRecord], List[AnyRecord]]:
+    # The API only filters by box, so the circle is covered by its bounding boxes and the corners are
+    # dropped here by exact distance; records without coordinates never match
+    limit = kwargs.pop('limit', 500)
+    mode = kwargs.pop('mode', 'dataclass')
+    lean = kwargs.pop('lean', False)
+    stream = kwargs.pop('stream', False)
+    if 'box' in kwargs:
+      raise ValueError('search_radius builds its own box: queries; pass other tags only')
+    if kwargs.pop('partition', False) or kwargs.pop('resume', None) is not None:
+      raise ValueError('search_radius does not support partition or resume')
+
+    query = XenoCantoQuerySchema.model_validate(kwargs)
+    boxes = radius_boxes(latitude, longitude, radius_km)
+
+    def _within() -> Iterator[XenoCantoRecordingSchema]:
+      yielded = 0
+      for box in boxes:
+        for r in self._search(query.model_copy(update={'box': box})):
+          if r.latitude is None or r.longitude is None:
+            continue
+          if distance_km(latitude, longitude, r.latitude, r.longitude) > radius_km:
+            continue
+          yield r
+          yielded += 1
+          if limit and yielded >= limit:
+            return
+
+    if mode == 'dataframe':
+      return to_dataframe(_within(), lean)
+
+    it = self._map(_within(), mode, lean)
+    return it if stream else list(it)
+
   def search_ids(
     self,
     rids: List[T.RecordingId],
@@ -361,26 +740,13 @@ class Client:
       try:
         yield from self._map(_stream_and_filter(), mode, lean)
       finally:
+        self._save_coverage()
         if self._verbose and failed_ids:
           self._warn_failed_ids(failed_ids)
 
+    # Records arrive in ascending catalogue-number order, so no sort is needed
     gen = _generator()
-    if stream:
-      return gen
-
-    results = list(gen)
-
-    def sort_key(item: Any):
-      if isinstance(item, dict):
-        return int(item.get('id', 0))
-      return int(getattr(item, 'id', 0))
-
-    try:
-      results.sort(key=sort_key)
-    except (ValueError, TypeError):
-      pass
-
-    return results
+    return gen if stream else list(gen)
 
   def search_id_range(
     self,
@@ -411,22 +777,126 @@ class Client:
         yield from self._map(_stream_and_filter(), mode, lean)
 
       finally:
+        self._save_coverage()
         if self._verbose and failed_ids:
           self._warn_failed_ids(failed_ids)
 
+    # Records arrive in ascending catalogue-number order, so no sort is needed
     gen = _generator()
-    if stream:
-      return gen
+    return gen if stream else list(gen)
 
-    results = list(gen)
+  def count(self, **kwargs: Unpack[XenoCantoQueryParams]) -> QueryCount:
+    query = XenoCantoQuerySchema.model_validate(kwargs)
+    return self._count_from_probe(self._probe(query))
 
+  def estimate(self, limit: Optional[int] = None, **kwargs: Unpack[XenoCantoQueryParams]) -> QueryEstimate:
+    query = XenoCantoQuerySchema.model_validate(kwargs)
+    probe = self._probe(query)
+    count = self._count_from_probe(probe)
+
+    n = count.num_recordings if limit is None else min(limit, count.num_recordings)
+    requests = max(1, -(-n // self._XC_MAX_PAGE_SIZE))
+
+    # The probe page is a sample of the result set; extrapolate its mean length
+    avg_length = mean_length(probe.recordings)
+    transfer_bytes = int(avg_length.total_seconds() * n * self._ESTIMATED_BITRATE / 8) if avg_length else 0
+
+    # The first `burst` requests are not throttled
+    throttled = max(0, requests - self._RATE_BURST)
+    wall_time = timedelta(seconds=throttled / self._RATE_PER_SECOND)
+
+    return QueryEstimate(
+      count=count,
+      requests=requests,
+      transfer_bytes=transfer_bytes,
+      wall_time=wall_time,
+      mean_length=avg_length,
+    )
+
+  def crawl(
+    self,
+    sink: RecordSink,
+    checkpoint: Union[str, Path],
+    start: int = 1,
+    stop: Optional[int] = None,
+    range_size: int = _XC_MAX_PAGE_SIZE,
+    max_retries: int = 3,
+  ) -> CrawlReport:
+    stop = self._XC_MAX_ID - 1 if stop is None else stop
+    self._sanitize_rid(start)
+    self._sanitize_rid(stop)
+
+    if start > stop:
+      raise ValueError('Start ID must be less than or equal to stop ID.')
+
+    crawler = CatalogueCrawler(
+      search=self._search_nr_range,
+      sink=sink,
+      checkpoint=checkpoint,
+      range_size=range_size,
+      max_retries=max_retries,
+      max_workers=self._max_workers,
+      verbose=self._verbose,
+    )
     try:
-      results.sort(key=lambda x: getattr(x, 'id', 0) if not isinstance(x, dict) else x.get('id', 0))
+      report = crawler.run(start, stop)
+    finally:
+      self._save_coverage()
 
-    except (AttributeError, KeyError):
-      pass
+    if report.failed:
+      failed_str = ', '.join(f'{a}-{b}' for a, b in report.failed)
+      warnings.warn(f'Failed to crawl the following ranges, re-run to retry them: {failed_str}')
+
+    return report
+
+  def _fetch_nr_range_or_none(
+    self,
+    bounds: Tuple[int, int],
+    refresh: bool = False,
+  ) -> Optional[List[XenoCantoRecordingSchema]]:
+    try:
+      return self._search_nr_range(*bounds, refresh=refresh)
+    except Exception as e:
+      if self._verbose:
+        warnings.warn(f'Error fetching range {bounds[0]}-{bounds[1]}: {e}')
+      return None
+
+  def sync(
+    self,
+    store: RecordStore,
+    start: int = 1,
+    stop: Optional[int] = None,
+    range_size: int = _XC_MAX_PAGE_SIZE,
+  ) -> RecordDiff:
+    stop = self._XC_MAX_ID - 1 if stop is None else stop
+    self._sanitize_rid(start)
+    self._sanitize_rid(stop)
+
+    if start > stop:
+      raise ValueError('Start ID must be less than or equal to stop ID.')
 
-    return results
+    ranges = [(i, min(i + range_size - 1, stop)) for i in range(start, stop + 1, range_size)]
+    diff = RecordDiff()
+    failed: List[Tuple[int, int]] = []
+
+    # NOTE A range that failed to fetch is left untouched, so its stored records are never reported as removed.
+    # Pages are revalidated with the server rather than read from the cache, which keeps closed nr ranges
+    # for months; unchanged pages still cost only a 304
+    fetch = partial(self._fetch_nr_range_or_none, refresh=True)
+    try:
+      for bounds, records in zip(ranges, ordered_map(fetch, ranges, self._max_workers)):
+        if records is None:
+          failed.append(bounds)
+          continue
+        diff.extend(store.sync(records, scope=bounds))
+    finally:
+      self._save_coverage()
+
+    if failed:
+      failed_str = ', '.join(f'{a}-{b}' for a, b in failed)
+      warnings.warn(f'Failed to sync the following ranges, re-run to retry them: {failed_str}')
+
+    return diff
 
   def get_by_id(self, rid: T.RecordingId, mode: ReturnMode = 'dataclass', lean: bool = False) -> Optional[AnyRecord]:
     srid = self._sanitize_rid(rid)
@@ -437,60 +907,150 @@ class Client:
   def sample(self, k: int, mode: ReturnMode = 'dataclass', lean: bool = False) -> List[AnyRecord]:
     if not 1 <= k <= 500:
       raise ValueError(k)
-    rs = self._sample(k)
+    try:
+      rs = self._sample(k)
+    finally:
+      self._save_coverage()
     return list(self._map(rs, mode, lean))
 
-  from datetime import datetime
-
   def download(
     self,
     recordings: Union[List[XenoCantoRecord], Iterator[XenoCantoRecord], List[int]],
     target_dir: Optional[Union[str, Path]] = None,
-    grouping: Literal['flat', 'species', 'recordist'] = 'flat',
-    naming: Literal['original', 'catalogue'] = 'original',
+    grouping: Grouping = 'flat',
+    naming: Naming = 'original',
     replace_ws: bool = False,
     sep: str = '-',
+    max_seconds: Optional[float] = None,
+    store: Optional[Union[str, Path, ObjectStore]] = None,
+    link: LinkMode = 'hardlink',
   ):
-    rs_list: Union[List[XenoCantoRecord], List[int]] = list(recordings)
-    rs: List[XenoCantoRecord] = []
-
-    if not recordings:
+    rs = self._resolve_records(recordings)
+    if not rs:
       return
 
-    if isinstance(rs_list[0], int):
-      fetched = self._search_id_scattered(rs_list)  # type: ignore
-      rs = [r for _, r in fetched if r is not None]
+    root = master_dir(target_dir)
+    root.mkdir(parents=True, exist_ok=True)
 
-    else:
-      rs = rs_list
+    if store is not None and not isinstance(store, ObjectStore):
+      store = ObjectStore(store)
 
-    if target_dir is None:
-      # Generate safe timestamp: 2026-01-02T13-57-53
-      timestamp = datetime.now().isoformat(timespec='seconds').replace(':', '-')
-      master_dir = Path.cwd() / f'xc-recordings-{timestamp}'
-    else:
-      master_dir = Path(target_dir)
+    for r in rs:
+      to_dir = root / group_dir(r, grouping, sep, replace_ws)
+      to_dir.mkdir(exist_ok=True)
 
-    master_dir.mkdir(parents=True, exist_ok=True)
+      path = to_dir / file_name(r, naming)
 
-    for r in rs:
-      if grouping == 'species':
-        to_dir = master_dir / (r.genus + sep + r.epithet).lower()
+      if store is not None:
+        # Layouts are materialized as links into the store; each file is fetched at most once
+        variant = 'full' if max_seconds is None else f'{max_seconds:g}s'
+        obj = store.lookup(r.number, variant)
+
+        if obj is None:
+          if max_seconds is None:
+            chunks = self._download_stream(str(r.file_download))
+          else:
+            chunks = [self._fetch_audio(r, max_seconds)]
+          obj = store.put(r.number, chunks, variant)
 
-      elif grouping == 'recordist':
-        if r.recordist is not None:
-          to_dir = master_dir / r.recordist.lower()
-        else:
-          to_dir = master_dir / 'unknown'
+        store.link(obj, path, link)
 
+      elif max_seconds is None:
+        self._download_to_path(str(r.file_download), path)
       else:
-        to_dir = master_dir
+        path.write_bytes(self._fetch_audio(r, max_seconds))
 
-      to_dir.mkdir(exist_ok=True)
+  def stream_download(self, recording: XenoCantoRecord, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[memoryview]:
+    # Chunks share one buffer: consume (or copy) each chunk before requesting the next
+    if not recording.file_download:
+      raise ValueError(f'Recording {recording.number} has no downloadable file')
+
+    return self._download_stream(str(recording.file_download), chunk_size)
+
+  def download_to(
+    self,
+    recording: XenoCantoRecord,
+    sink: ChunkSink,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+  ) -> int:
+    # `sink` is a writable binary file or a callable, e.g. an incremental decoder's feed method
+    return feed(self.stream_download(recording, chunk_size), sink)
+
+  def download_images(
+    self,
+    recordings: Union[List[XenoCantoRecord], Iterator[XenoCantoRecord], List[int]],
+    target_dir: Optional[Union[str, Path]] = None,
+    kinds: Iterable[ImageKind] = ('sonogram',),
+    sizes: Iterable[ImageSize] = ('small',),
+    grouping: Grouping = 'flat',
+    naming: Naming = 'original',
+    replace_ws: bool = False,
+    sep: str = '-',
+  ) -> List[Path]:
+    rs = self._resolve_records(recordings)
+    if not rs:
+      return []
+
+    root = master_dir(target_dir)
+    kinds, sizes = list(kinds), list(sizes)
+
+    paths: List[Path] = []
+    jobs: List[Tuple[str, Path]] = []
+
+    for r in rs:
+      to_dir = root / group_dir(r, grouping, sep, replace_ws)
+
+      for kind in kinds:
+        for size in sizes:
+          url = image_url(r, kind, size)
+          if url is None:
+            continue
+
+          path = to_dir / image_name(r, naming, kind, size, url)
+          paths.append(path)
+
+          if not path.exists():
+            jobs.append((url, path))
+
+    def _fetch(job: Tuple[str, Path]) -> None:
+      url, path = job
+      path.parent.mkdir(parents=True, exist_ok=True)
+
+      tmp = path.with_name(path.name + '.part')
+      tmp.write_bytes(self._download_promise(url))
+      tmp.replace(path)
 
-      path = to_dir / r.file_name
+    for _ in ordered_map(_fetch, jobs, self._max_workers):
+      pass
+
+    return paths
+
+  def download_shards(
+    self,
+    recordings: Union[List[XenoCantoRecord], Iterator[XenoCantoRecord], List[int]],
+    target_dir: Optional[Union[str, Path]] = None,
+    grouping: Grouping = 'flat',
+    shard_size: int = ShardWriter.DEFAULT_SHARD_SIZE,
+    replace_ws: bool = False,
+    sep: str = '-',
+  ) -> Optional[Path]:
+    rs = self._resolve_records(recordings)
+    if not rs:
+      return None
 
-      if naming == 'catalogue':
-        path = path.with_stem(str(r.number))
+    root = master_dir(target_dir, prefix='xc-shards')
+
+    def _fetch(r: XenoCantoRecord) -> Tuple[XenoCantoRecord, bytes]:
+      return r, self._download_promise(str(r.file_download))
+
+    with ShardWriter(root, shard_size=shard_size) as writer:
+      for r, data in ordered_map(_fetch, rs, self._max_workers):
+        writer.write(
+          group=group_dir(r, grouping, sep, replace_ws),
+          key=f'xc{r.number}',
+          data=data,
+          ext=Path(r.file_name or '.mp3').suffix.lstrip('.') or 'mp3',
+          metadata=record_metadata(r),
+        )
 
-      path.write_bytes(r.f)
+    return root
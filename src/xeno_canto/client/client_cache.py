@@ -0,0 +1,177 @@
+from xeno_canto.query.query_compiled import CompiledQuery
+from xeno_canto.client.client_cache_backend import Codec
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import (
+  date,
+  datetime,
+  timedelta,
+)
+from typing import (
+  Any,
+  Callable,
+  Generic,
+  Hashable,
+  Optional,
+  Protocol,
+  Tuple,
+  TypeVar,
+  Union,
+)
+import threading
+
+V = TypeVar('V')
+
+
+class TtlRule(Protocol):
+  # Returns the TTL for pages of this query, or None to defer to the other rules
+  def __call__(self, query: CompiledQuery) -> Optional[timedelta]: ...
+
+
+@dataclass(frozen=True)
+class TagTtl:
+  tag: str
+  ttl: timedelta
+
+  def __call__(self, query: CompiledQuery) -> Optional[timedelta]:
+    return self.ttl if query.get(self.tag) is not None else None
+
+
+def _upper_bound(v: str) -> Tuple[bool, Optional[float]]:
+  # (has an upper bound, the bound) for '2015', '=2015', '<2015', '1-500' and '>2015'
+  if v.startswith('>'):
+    return False, None
+
+  _, sep, upper = v.lstrip('<=').partition('-')
+  if not sep:
+    upper = v.lstrip('<=')
+  try:
+    return True, float(upper)
+  except ValueError:
+    return True, None
+
+
+@dataclass(frozen=True)
+class RangeTtl:
+  # Values with an upper bound below `horizon` (e.g. nr:1-500, year:2015) get `closed`;
+  # values without one (e.g. nr:">900000", year:">2020") get `open`
+  tag: str
+  closed: Optional[timedelta]
+  open: Optional[timedelta]
+  horizon: Optional[Callable[[], float]] = None
+
+  def __call__(self, query: CompiledQuery) -> Optional[timedelta]:
+    v = query.get(self.tag)
+    if v is None:
+      return None
+
+    bounded, upper = _upper_bound(v)
+    if not bounded:
+      return self.open
+    if upper is None or (self.horizon is not None and upper >= self.horizon()):
+      return None
+    return self.closed
+
+
+def _current_year() -> float:
+  return date.today().year
+
+
+class CatalogueHorizon:
+  # NOTE The newest catalogue number seen so far, shared process-wide like the clock behind `year`: numbers at or
+  # above it are still being assigned. Until a page has been seen nothing counts as closed
+  def __init__(self):
+    self._newest: Optional[int] = None
+    self._lock = threading.Lock()
+
+  @property
+  def known(self) -> bool:
+    with self._lock:
+      return self._newest is not None
+
+  def observe(self, number: int) -> None:
+    # Pages arrive from worker threads in any order; the horizon only ever moves forward
+    with self._lock:
+      if self._newest is None or number > self._newest:
+        self._newest = number
+
+  def __call__(self) -> float:
+    with self._lock:
+      return float('-inf') if self._newest is None else self._newest
+
+
+CATALOGUE_HORIZON = CatalogueHorizon()
+
+
+DEFAULT_TTL_RULES: Tuple[TtlRule, ...] = (
+  TagTtl('since', timedelta(hours=1)),
+  RangeTtl('nr', closed=timedelta(days=90), open=timedelta(hours=1), horizon=CATALOGUE_HORIZON),
+  RangeTtl('year', closed=timedelta(days=90), open=timedelta(hours=1), horizon=_current_year),
+)
+
+
+@dataclass(frozen=True)
+class TtlPolicy:
+  rules: Tuple[TtlRule, ...] = DEFAULT_TTL_RULES
+
+  # NOTE A query is as volatile as its most volatile term, so the shortest matching TTL wins;
+  # None means no rule matched and the session's default TTL applies
+  def ttl(self, query: CompiledQuery) -> Optional[timedelta]:
+    matches = [t for t in (rule(query) for rule in self.rules) if t is not None]
+    return min(matches) if matches else None
+
+
+@dataclass(frozen=True)
+class CacheConfig:
+  ttl: timedelta = timedelta(days=1)
+  # Expired pages are kept with their ETag/Last-Modified and revalidated with a conditional request;
+  # a 304 only extends the entry's expiry
+  always_revalidate: bool = False
+  # Serve expired pages immediately and revalidate them in the background; a timedelta bounds the staleness
+  stale_while_revalidate: Union[bool, timedelta] = False
+  memo_size: int = 256  # Parsed pages kept in memory
+  policy: Optional[TtlPolicy] = TtlPolicy()  # Per-query TTLs; `ttl` applies to queries no rule matches
+  # Stored pages are compressed and the least recently used are evicted beyond `max_size` bytes;
+  # None for both keeps requests-cache's plain SQLite backend
+  compression: Optional[Codec] = 'zlib'
+  max_size: Optional[int] = 512 << 20
+
+
+class PageMemo(Generic[V]):
+  # NOTE Keyed by URL and the cached entry's creation time: a 304 keeps `created_at`, so a revalidated
+  # page is served from the memo, while a 200 that replaced the entry gets a new key and is parsed again
+  def __init__(self, maxsize: int = 256):
+    self._maxsize = maxsize
+    self._entries: 'OrderedDict[Hashable, V]' = OrderedDict()
+    self._lock = threading.Lock()
+
+  @staticmethod
+  def key(resp: Any) -> Optional[Hashable]:
+    created_at: Optional[datetime] = getattr(resp, 'created_at', None)
+    if created_at is None or not getattr(resp, 'from_cache', False):
+      return None
+    return resp.url, created_at
+
+  def get_or_parse(self, resp: Any, parse: Callable[[Any], V]) -> V:
+    key = self.key(resp) if self._maxsize > 0 else None
+    if key is None:
+      return parse(resp)
+
+    with self._lock:
+      if key in self._entries:
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    value = parse(resp)
+
+    with self._lock:
+      self._entries[key] = value
+      while len(self._entries) > self._maxsize:
+        self._entries.popitem(last=False)
+
+    return value
+
+  def clear(self) -> None:
+    with self._lock:
+      self._entries.clear()
@@ -0,0 +1,228 @@
+from requests_cache import (
+  BaseCache,
+  SerializerPipeline,
+  SQLiteDict,
+  SQLiteCache,
+  Stage,
+)
+from requests_cache.serializers.preconf import base_stage
+
+from typing import (
+  Any,
+  Callable,
+  Dict,
+  Literal,
+  Optional,
+  Tuple,
+)
+from time import time
+import importlib
+import pickle
+import threading
+import zlib
+
+Codec = Literal['zlib', 'zstd']
+
+_CODEC_TAGS = {b'z': 'zlib', b's': 'zstd'}
+
+
+def _codec_functions(codec: Codec, level: Optional[int]) -> Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+  match codec:
+    case 'zlib':
+      zlevel = 6 if level is None else level
+      return (lambda b: zlib.compress(b, zlevel)), zlib.decompress
+
+    case 'zstd':
+      try:
+        zstd = importlib.import_module('zstandard')
+      except ImportError:
+        raise ImportError(
+          "zstd compression requires the 'zstandard' package; install it with: pip install 'xc-api-py[cache]'"
+        ) from None
+      compressor = zstd.ZstdCompressor(level=3 if level is None else level)
+      decompressor = zstd.ZstdDecompressor()
+      return compressor.compress, decompressor.decompress
+
+  raise ValueError(codec)
+
+
+class CompressionStage(Stage):
+  # NOTE Bodies carry a one-byte codec tag, so a cache written with another codec (or uncompressed,
+  # by an older version) fails with ValueError, which requests-cache treats as a miss
+  def __init__(self, codec: Codec = 'zlib', level: Optional[int] = None):
+    self.codec = codec
+    self.tag = next(t for t, c in _CODEC_TAGS.items() if c == codec)
+    self._compress, self._decompress = _codec_functions(codec, level)
+    super().__init__(dumps=self._tagged_compress, loads=self._tagged_decompress)
+
+  def _tagged_compress(self, value: bytes) -> bytes:
+    return self.tag + self._compress(value)
+
+  def _tagged_decompress(self, value: bytes) -> bytes:
+    if value[:1] != self.tag:
+      raise ValueError(f'Cached value was not written with {self.codec}')
+    try:
+      return self._decompress(value[1:])
+    except Exception as e:
+      raise ValueError(e) from None
+
+
+def compressed_serializer(codec: Codec = 'zlib', level: Optional[int] = None) -> SerializerPipeline:
+  return SerializerPipeline(
+    [base_stage, Stage(pickle), CompressionStage(codec, level)],
+    name=f'pickle-{codec}',
+    is_binary=True,
+  )
+
+
+class BoundedSQLiteDict(SQLiteDict):
+  # LRU by last access; the stored size is checked every `check_every` writes rather than on each one,
+  # and the file is vacuumed once evictions have freed `vacuum_after` bytes (a quarter of `max_size` by default)
+  def __init__(
+    self,
+    db_path: Any,
+    max_size: Optional[int] = None,
+    check_every: int = 32,
+    vacuum_after: Optional[int] = None,
+    touch_every: int = 256,
+    touch_interval: float = 60.0,
+    **kwargs,
+  ):
+    self.max_size = max_size
+    self.check_every = check_every
+    self.vacuum_after = vacuum_after
+    if vacuum_after is None and max_size is not None:
+      self.vacuum_after = max_size // 4
+    self._writes = 0
+    self._freed = 0
+    # NOTE Reads never write: access times are buffered and flushed in one transaction per `touch_every` hits
+    # or `touch_interval` seconds, and before evicting. LRU order is only as fine as the flush interval
+    self.touch_every = touch_every
+    self.touch_interval = touch_interval
+    self._touched: Dict[str, float] = {}
+    self._touch_lock = threading.Lock()
+    self._flushed_at = time()
+    super().__init__(db_path, **kwargs)
+
+  def init_db(self):
+    super().init_db()
+    with self.connection(commit=True) as con:
+      cols = {row[1] for row in con.execute(f'PRAGMA table_info({self.table_name})')}
+      if 'accessed' not in cols:
+        con.execute(f'ALTER TABLE {self.table_name} ADD COLUMN accessed REAL')
+      con.execute(f'CREATE INDEX IF NOT EXISTS accessed_idx ON {self.table_name}(accessed)')
+
+  def __getitem__(self, key):
+    value = super().__getitem__(key)
+    now = time()
+    with self._touch_lock:
+      self._touched[key] = now
+      due = len(self._touched) >= self.touch_every or now - self._flushed_at >= self.touch_interval
+    if due:
+      self.flush_access()
+    return value
+
+  def flush_access(self) -> None:
+    with self._touch_lock:
+      touched, self._touched = self._touched, {}
+      self._flushed_at = time()
+    if touched:
+      with self.connection(commit=True) as con:
+        con.executemany(f'UPDATE {self.table_name} SET accessed=? WHERE key=?', [(t, k) for k, t in touched.items()])
+
+  def close(self):
+    self.flush_access()
+    super().close()
+
+  def _write(self, key, value):
+    expires = getattr(value, 'expires_unix', None)
+    value = self.serialize(value)
+    with self.connection(commit=True) as con:
+      con.execute(
+        f'INSERT OR REPLACE INTO {self.table_name} (key,value,expires,accessed) VALUES (?,?,?,?)',
+        (key, value, expires, time()),
+      )
+
+    self._writes += 1
+    if self.max_size is not None and self._writes % self.check_every == 0:
+      self.evict()
+
+  def stored_size(self) -> int:
+    with self.connection() as con:
+      return con.execute(f'SELECT COALESCE(SUM(LENGTH(value)), 0) FROM {self.table_name}').fetchone()[0]
+
+  def evict(self, max_size: Optional[int] = None) -> int:
+    max_size = self.max_size if max_size is None else max_size
+    if max_size is None:
+      return 0
+
+    self.flush_access()
+    with self._lock:
+      excess = self.stored_size() - max_size
+      if excess <= 0:
+        return 0
+
+      # Drop least recently used entries, expired ones first, until the stored bytes fit again
+      victims, freed = [], 0
+      with self.connection() as con:
+        rows = con.execute(
+          f'SELECT key, LENGTH(value) FROM {self.table_name}'
+          '  ORDER BY (expires IS NOT NULL AND expires <= ?) DESC, accessed ASC',
+          (time(),),
+        )
+        for key, size in rows:
+          if freed >= excess:
+            break
+          victims.append(key)
+          freed += size or 0
+        rows.close()  # An unfinished statement would block VACUUM
+
+      self.bulk_delete(victims)
+      self._freed += freed
+
+      if self.vacuum_after is not None and self._freed >= self.vacuum_after:
+        self.vacuum()
+        self._freed = 0
+
+    return len(victims)
+
+
+class BoundedSQLiteCache(SQLiteCache):
+  def __init__(
+    self,
+    db_path: Any = 'http_cache',
+    max_size: Optional[int] = None,
+    codec: Optional[Codec] = 'zlib',
+    level: Optional[int] = None,
+    check_every: int = 32,
+    vacuum_after: Optional[int] = None,
+    serializer: Optional[Any] = None,
+    **kwargs,
+  ):
+    # NOTE Bypasses SQLiteCache.__init__, which would create a plain responses table first
+    BaseCache.__init__(self, cache_name=str(db_path), **kwargs)
+    if codec is not None:
+      serializer = compressed_serializer(codec, level)
+    skwargs = {'serializer': serializer, **kwargs} if serializer else kwargs
+
+    self.responses: BoundedSQLiteDict = BoundedSQLiteDict(
+      db_path,
+      max_size=max_size,
+      check_every=check_every,
+      vacuum_after=vacuum_after,
+      table_name='responses',
+      **skwargs,
+    )
+    self.redirects: SQLiteDict = SQLiteDict(
+      db_path,
+      table_name='redirects',
+      lock=self.responses._lock,
+      serializer=None,
+      **kwargs,
+    )
+
+  def evict(self, max_size: Optional[int] = None) -> int:
+    n = self.responses.evict(max_size)
+    if n:
+      self._prune_redirects()
+    return n
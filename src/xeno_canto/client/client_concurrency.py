@@ -0,0 +1,105 @@
+from concurrent.futures import ThreadPoolExecutor, Future
+from collections import deque
+from itertools import islice
+from typing import (
+  Any,
+  Callable,
+  Deque,
+  Iterable,
+  Iterator,
+  Optional,
+  Tuple,
+  TypeVar,
+)
+import queue
+import threading
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def ordered_map(
+  fn: Callable[[T], R],
+  items: Iterable[T],
+  max_workers: int,
+  window: Optional[int] = None,
+) -> Iterator[R]:
+  # NOTE Results are yielded in input order; at most `window` calls are in flight (or buffered) at once
+  window = window or max_workers * 2
+  it = iter(items)
+
+  with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    pending: Deque[Future] = deque(executor.submit(fn, item) for item in islice(it, window))
+
+    try:
+      while pending:
+        result = pending.popleft().result()
+        for item in islice(it, 1):
+          pending.append(executor.submit(fn, item))
+        yield result
+
+    finally:
+      for f in pending:
+        f.cancel()
+
+
+_DONE = object()
+
+
+def ordered_stream(
+  fn: Callable[[T], Iterable[R]],
+  items: Iterable[T],
+  max_workers: int,
+  buffer: int,
+  window: Optional[int] = None,
+) -> Iterator[R]:
+  # NOTE Like ordered_map for functions returning iterables: each call is drained by a worker into a queue of
+  # at most `buffer` results, and queues are consumed in input order, so no call's output is held in full
+  window = window or max_workers * 2
+  stop = threading.Event()
+  it = iter(items)
+
+  def put(q: queue.Queue, v: Tuple[Any, Any]) -> bool:
+    while not stop.is_set():
+      try:
+        q.put(v, timeout=0.1)
+        return True
+      except queue.Full:
+        continue
+    return False
+
+  def produce(item: T, q: queue.Queue) -> None:
+    try:
+      for r in fn(item):
+        if not put(q, (r, None)):
+          return
+      put(q, (_DONE, None))
+    except BaseException as e:
+      put(q, (_DONE, e))
+
+  with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+    def submit(item: T) -> Tuple[Future, queue.Queue]:
+      q: queue.Queue = queue.Queue(maxsize=buffer)
+      return executor.submit(produce, item, q), q
+
+    pending: Deque[Tuple[Future, queue.Queue]] = deque(submit(item) for item in islice(it, window))
+
+    try:
+      while pending:
+        _, q = pending.popleft()
+        for item in islice(it, 1):
+          pending.append(submit(item))
+
+        while True:
+          r, error = q.get()
+          if error is not None:
+            raise error
+          if r is _DONE:
+            break
+          yield r
+
+    finally:
+      stop.set()
+      for f, _ in pending:
+        f.cancel()
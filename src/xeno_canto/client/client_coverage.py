@@ -0,0 +1,108 @@
+from array import array
+from datetime import date, timedelta
+from pathlib import Path
+from typing import (
+  Iterable,
+  List,
+  Union,
+)
+import struct
+
+UNKNOWN = 0
+PRESENT = 1
+ABSENT = 2
+
+_MAGIC = b'XCCOV1'
+_HEADER = struct.Struct('<6sI')
+
+
+def _today() -> int:
+  return date.today().toordinal()
+
+
+class CoverageMap:
+  # One state byte and one uint16 check-day per catalogue number; ~3 bytes/id, ~2.8MB for the whole catalogue
+  def __init__(self, size: int, ttl: timedelta = timedelta(days=30)):
+    # NOTE Checks are stamped by day, so a TTL under a day would expire every absence immediately
+    if ttl < timedelta(days=1):
+      raise ValueError(f'Coverage TTL must be at least one day, got {ttl}')
+
+    self._size = size
+    self._ttl_days = ttl.days
+    self._epoch = date(2000, 1, 1).toordinal()
+    self._states = bytearray(size + 1)
+    self._checked = array('H', bytes(2 * (size + 1)))
+
+  @property
+  def size(self) -> int:
+    return self._size
+
+  def _mark(self, rids: Iterable[int], state: int) -> None:
+    day = _today() - self._epoch
+    for rid in rids:
+      if 0 < rid <= self._size:
+        self._states[rid] = state
+        self._checked[rid] = day
+
+  def mark_present(self, rids: Iterable[int]) -> None:
+    self._mark(rids, PRESENT)
+
+  def mark_absent(self, rids: Iterable[int]) -> None:
+    self._mark(rids, ABSENT)
+
+  def state(self, rid: int) -> int:
+    if not 0 < rid <= self._size:
+      return UNKNOWN
+
+    s = self._states[rid]
+    if s == ABSENT and _today() - self._epoch - self._checked[rid] >= self._ttl_days:
+      # NOTE Expired absences are rechecked; the id may have been assigned since
+      return UNKNOWN
+
+    return s
+
+  def is_absent(self, rid: int) -> bool:
+    return self.state(rid) == ABSENT
+
+  def is_range_absent(self, start: int, stop: int) -> bool:
+    # Cheap rejection on the raw states before checking each id's age
+    for s in (PRESENT, UNKNOWN):
+      if self._states.find(bytes([s]), start, stop + 1) >= 0:
+        return False
+
+    return all(self.is_absent(rid) for rid in range(start, stop + 1))
+
+  def filter_absent(self, rids: Iterable[int]) -> List[int]:
+    return [rid for rid in rids if not self.is_absent(rid)]
+
+  def save(self, path: Union[str, Path]) -> None:
+    path = Path(path)
+    tmp = path.with_suffix(path.suffix + '.tmp')
+
+    with tmp.open('wb') as f:
+      f.write(_HEADER.pack(_MAGIC, self._size))
+      f.write(self._states)
+      self._checked.tofile(f)
+
+    tmp.replace(path)
+
+  @classmethod
+  def load(cls, path: Union[str, Path], size: int, ttl: timedelta = timedelta(days=30)) -> 'CoverageMap':
+    cm = cls(size, ttl)
+    path = Path(path)
+    if not path.exists():
+      return cm
+
+    with path.open('rb') as f:
+      magic, stored_size = _HEADER.unpack(f.read(_HEADER.size))
+      if magic != _MAGIC:
+        raise ValueError(f'{path} is not a coverage map')
+
+      n = min(stored_size, size) + 1
+      cm._states[:n] = f.read(stored_size + 1)[:n]
+
+      checked = array('H')
+      checked.fromfile(f, stored_size + 1)
+      cm._checked[:n] = checked[:n]
+
+    return cm
@@ -0,0 +1,135 @@
+from xeno_canto.recording.recording_schema import XenoCantoRecordingSchema
+from xeno_canto.client.client_concurrency import ordered_map
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+  Callable,
+  Iterable,
+  Iterator,
+  List,
+  Optional,
+  Protocol,
+  Set,
+  Tuple,
+  Union,
+)
+import json
+import threading
+import time
+import warnings
+
+IdRange = Tuple[int, int]
+
+
+class RecordSink(Protocol):
+  def write(self, records: List[XenoCantoRecordingSchema]) -> None: ...
+
+
+class JsonLinesSink:
+  def __init__(self, path: Union[str, Path]):
+    self._path = Path(path)
+    self._lock = threading.Lock()
+
+  def write(self, records: List[XenoCantoRecordingSchema]) -> None:
+    with self._lock, self._path.open('a', encoding='utf-8') as f:
+      for r in records:
+        f.write(r.model_dump_json(exclude_computed_fields=True) + '\n')
+
+
+@dataclass
+class CrawlReport:
+  completed: int = 0
+  skipped: int = 0
+  records: int = 0
+  failed: List[IdRange] = field(default_factory=list)
+
+
+class CatalogueCrawler:
+  def __init__(
+    self,
+    search: Callable[[int, int], Iterable[XenoCantoRecordingSchema]],
+    sink: RecordSink,
+    checkpoint: Union[str, Path],
+    range_size: int = 500,
+    max_retries: int = 3,
+    max_workers: int = 1,
+    verbose: bool = False,
+  ):
+    if range_size < 1:
+      raise ValueError(range_size)
+
+    self._search = search
+    self._sink = sink
+    self._checkpoint = Path(checkpoint)
+    self._range_size = range_size
+    self._max_retries = max_retries
+    self._max_workers = max_workers
+    self._verbose = verbose
+
+  def _ranges(self, start: int, stop: int) -> Iterator[IdRange]:
+    for i in range(start, stop + 1, self._range_size):
+      yield i, min(i + self._range_size - 1, stop)
+
+  def _load_checkpoint(self) -> Set[IdRange]:
+    if not self._checkpoint.exists():
+      return set()
+
+    state = json.loads(self._checkpoint.read_text(encoding='utf-8'))
+    if state.get('range_size') != self._range_size:
+      raise ValueError(
+        f'Checkpoint {self._checkpoint} was written with range_size={state.get("range_size")}, not {self._range_size}'
+      )
+
+    return {(a, b) for a, b in state['completed']}
+
+  def _save_checkpoint(self, completed: Set[IdRange]) -> None:
+    # Write-then-rename, so a crash never leaves a truncated checkpoint behind
+    tmp = self._checkpoint.with_suffix(self._checkpoint.suffix + '.tmp')
+    tmp.write_text(
+      json.dumps(dict(range_size=self._range_size, completed=sorted(completed))),
+      encoding='utf-8',
+    )
+    tmp.replace(self._checkpoint)
+
+  def _fetch_range(self, bounds: IdRange) -> Tuple[IdRange, Optional[List[XenoCantoRecordingSchema]]]:
+    a, b = bounds
+
+    for attempt in range(self._max_retries + 1):
+      try:
+        return bounds, list(self._search(a, b))
+
+      except Exception as e:
+        if self._verbose:
+          warnings.warn(f'Error fetching range {a}-{b} (attempt {attempt + 1}/{self._max_retries + 1}): {e}')
+
+        if attempt < self._max_retries:
+          time.sleep(2**attempt)
+
+    return bounds, None
+
+  def run(self, start: int, stop: int) -> CrawlReport:
+    completed = self._load_checkpoint()
+    report = CrawlReport()
+
+    pending = []
+    for bounds in self._ranges(start, stop):
+      if bounds in completed:
+        report.skipped += 1
+      else:
+        pending.append(bounds)
+
+    # NOTE A range is written to the sink before it is checkpointed; a crash in between replays that range only
+    for bounds, records in ordered_map(self._fetch_range, pending, self._max_workers):
+      if records is None:
+        report.failed.append(bounds)
+        continue
+
+      self._sink.write(records)
+      completed.add(bounds)
+      self._save_checkpoint(completed)
+
+      report.completed += 1
+      report.records += len(records)
+
+    return report
@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+from typing import (
+  Any,
+  Callable,
+  Iterator,
+  Tuple,
+)
+import base64
+
+
+@dataclass(frozen=True)
+class SearchCursor:
+  fingerprint: str
+  page: int
+  offset: int
+
+  def to_token(self) -> str:
+    raw = f'{self.fingerprint}:{self.page}:{self.offset}'
+    return base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii').rstrip('=')
+
+  @classmethod
+  def from_token(cls, token: str) -> 'SearchCursor':
+    try:
+      raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode('ascii')
+      fingerprint, page, offset = raw.split(':')
+      cursor = cls(fingerprint=fingerprint, page=int(page), offset=int(offset))
+    except Exception:
+      raise ValueError(f'Invalid resume token "{token}"') from None
+
+    if cursor.page < 1 or cursor.offset < 0:
+      raise ValueError(f'Invalid resume token "{token}"')
+
+    return cursor
+
+
+class SearchStream(Iterator[Any]):
+  def __init__(
+    self,
+    positions: Iterator[Tuple[int, int, Any]],
+    mapper: Callable[[Any], Any],
+    cursor: SearchCursor,
+  ):
+    self._positions = positions
+    self._mapper = mapper
+    self._cursor = cursor
+
+  @property
+  def cursor(self) -> SearchCursor:
+    # Points just past the last record returned by this stream
+    return self._cursor
+
+  def __iter__(self) -> 'SearchStream':
+    return self
+
+  def __next__(self) -> Any:
+    page, offset, record = next(self._positions)
+    self._cursor = SearchCursor(self._cursor.fingerprint, page, offset + 1)
+    return self._mapper(record)
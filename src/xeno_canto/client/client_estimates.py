@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+from typing import (
+  Any,
+  Iterable,
+  Optional,
+)
+import datetime
+
+
+@dataclass(frozen=True)
+class QueryCount:
+  num_recordings: int
+  num_species: int
+  num_pages: int
+
+
+@dataclass(frozen=True)
+class QueryEstimate:
+  count: QueryCount
+  requests: int
+  transfer_bytes: int
+  wall_time: datetime.timedelta
+  mean_length: Optional[datetime.timedelta]
+
+
+def parse_length(v: Any) -> Optional[datetime.timedelta]:
+  # Raw XC lengths are 'm:ss' or 'h:mm:ss'
+  if not isinstance(v, str):
+    return None
+
+  try:
+    seconds = 0
+    for part in v.strip().split(':'):
+      seconds = seconds * 60 + int(part)
+  except ValueError:
+    return None
+
+  return datetime.timedelta(seconds=seconds)
+
+
+def mean_length(raw_records: Iterable[Any]) -> Optional[datetime.timedelta]:
+  lengths = [
+    length for r in raw_records if isinstance(r, dict) and (length := parse_length(r.get('length'))) is not None
+  ]
+  if not lengths:
+    return None
+
+  return sum(lengths, datetime.timedelta()) / len(lengths)
@@ -1,3 +1,11 @@
+from xeno_canto.client.client_cache import CacheConfig
+from xeno_canto.client.client_cache_backend import BoundedSQLiteCache
+from xeno_canto.client.client_transport import (
+  TransportConfig,
+  TransportMixin,
+  configure_transport,
+)
+
 from requests import Session
 from requests_cache import CacheMixin
 from requests_ratelimiter import (
@@ -9,13 +17,23 @@ from typing import Optional
 from datetime import timedelta
 
 
-class CachedLimiterSession(CacheMixin, LimiterMixin, Session): ...
+class TransportSession(TransportMixin, Session): ...
+
+
+class CachedLimiterSession(TransportMixin, CacheMixin, LimiterMixin, Session): ...
 
 
-def get_session(user_agent: Optional[str] = None, **kwargs):
-  s = Session(**kwargs)
+def get_session(
+  user_agent: Optional[str] = None,
+  transport: Optional[TransportConfig] = None,
+  max_workers: int = 1,
+  **kwargs,
+):
+  s = TransportSession(**kwargs)
   if user_agent:
     s.headers.update({'User-Agent': user_agent})
+  if transport is not None:
+    configure_transport(s, transport, max_workers)
   return s
 
 
@@ -34,8 +52,22 @@ def get_limiter_session(
 def get_cached_limiter_session(
   user_agent: Optional[str] = None,
   ttl: Optional[timedelta] = None,
+  transport: Optional[TransportConfig] = None,
+  max_workers: int = 1,
+  cache: Optional[CacheConfig] = None,
   **kwargs,
 ):
+  if cache is not None:
+    ttl = ttl or cache.ttl
+    kwargs.setdefault('always_revalidate', cache.always_revalidate)
+    kwargs.setdefault('stale_while_revalidate', cache.stale_while_revalidate)
+    if 'backend' not in kwargs and (cache.compression is not None or cache.max_size is not None):
+      kwargs['backend'] = BoundedSQLiteCache(
+        kwargs.get('cache_name', 'http_cache'),
+        max_size=cache.max_size,
+        codec=cache.compression,
+      )
+
   s = CachedLimiterSession(
     **kwargs,
     allowable_codes=[200],
@@ -49,4 +81,6 @@ def get_cached_limiter_session(
   )
   if user_agent:
     s.headers.update({'User-Agent': user_agent})
+  if transport is not None:
+    configure_transport(s, transport, max_workers)
   return s
@@ -1,8 +1,10 @@
 from xeno_canto.query.query_params import XenoCantoQueryParams
 from xeno_canto.client.client_types import ReturnMode
+from xeno_canto.client.client_cursor import SearchCursor
 
 from typing import (
   TypedDict,
+  Union,
 )
 
 
@@ -15,3 +17,5 @@ class SearchQueryParams(
   limit: int
   lean: bool
   stream: bool
+  partition: bool
+  resume: Union[SearchCursor, str]
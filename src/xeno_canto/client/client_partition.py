@@ -0,0 +1,78 @@
+from xeno_canto.query.query_compiled import CompiledQuery
+from xeno_canto.client.client_concurrency import ordered_map
+
+from typing import (
+  Callable,
+  List,
+  Optional,
+  Tuple,
+)
+
+
+class QueryPartitioner:
+  def __init__(
+    self,
+    probe: Callable[[CompiledQuery], int],
+    cap: int,
+    id_range: Tuple[int, int],
+    max_workers: int = 1,
+  ):
+    self._probe = probe
+    self._cap = cap
+    self._id_range = id_range
+    self._max_workers = max_workers
+
+  def _nr_range(self, query: CompiledQuery) -> Optional[Tuple[int, int]]:
+    nr = query.get('nr')
+    if nr is None:
+      return self._id_range
+
+    a, sep, b = nr.partition('-')
+    try:
+      lo, hi = int(a), int(b) if sep else int(a)
+    except ValueError:
+      return None
+
+    return lo, hi
+
+  def _split(self, query: CompiledQuery) -> List[CompiledQuery]:
+    bounds = self._nr_range(query)
+    if bounds is None or bounds[0] >= bounds[1]:
+      return []
+
+    lo, hi = bounds
+    mid = (lo + hi) // 2
+    return [
+      query.replace(nr=f'{lo}-{mid}'),
+      query.replace(nr=f'{mid + 1}-{hi}'),
+    ]
+
+  def _sort_key(self, query: CompiledQuery) -> int:
+    bounds = self._nr_range(query)
+    return bounds[0] if bounds else 0
+
+  def plan(self, query: CompiledQuery, limit: Optional[int] = None) -> List[CompiledQuery]:
+    # A limit within the cap is served by the unsplit query, so nothing needs probing
+    if limit is not None and limit <= self._cap:
+      return [query]
+
+    # Probe one level of the split tree at a time, so sibling ranges are probed concurrently
+    planned: List[CompiledQuery] = []
+    pending = [query]
+
+    while pending:
+      counts = list(ordered_map(self._probe, pending, self._max_workers))
+      next_level: List[CompiledQuery] = []
+
+      for q, count in zip(pending, counts):
+        if count == 0:
+          continue
+
+        if count <= self._cap or not (halves := self._split(q)):
+          planned.append(q)
+        else:
+          next_level.extend(halves)
+
+      pending = next_level
+
+    return sorted(planned, key=self._sort_key)
@@ -0,0 +1,57 @@
+from requests import Response
+from requests.adapters import HTTPAdapter
+
+from dataclasses import dataclass
+from typing import (
+  Any,
+  MutableMapping,
+  Optional,
+  Protocol,
+  Tuple,
+)
+
+
+@dataclass(frozen=True)
+class TransportConfig:
+  pool_connections: int = 4  # Number of hosts to keep pools for
+  pool_maxsize: Optional[int] = None  # Connections per host; defaults to the client's worker count
+  connect_timeout: Optional[float] = 10.0
+  read_timeout: Optional[float] = 60.0
+  compression: bool = True
+  max_retries: int = 0
+
+  @property
+  def timeout(self) -> Optional[Tuple[Optional[float], Optional[float]]]:
+    if self.connect_timeout is None and self.read_timeout is None:
+      return None
+    return self.connect_timeout, self.read_timeout
+
+
+class Transport(Protocol):
+  # Anything with a requests-like `get` can stand in for the HTTP sessions, e.g. an in-process fake
+  headers: MutableMapping[str, str]
+
+  def get(self, url: str, **kwargs: Any) -> Response: ...
+
+
+class TransportMixin:
+  transport_config: Optional[TransportConfig] = None
+
+  def request(self, method, url, *args, **kwargs):
+    if self.transport_config is not None:
+      kwargs.setdefault('timeout', self.transport_config.timeout)
+    return super().request(method, url, *args, **kwargs)  # type: ignore
+
+
+def configure_transport(s: Any, config: TransportConfig, max_workers: int) -> None:
+  s.transport_config = config
+
+  adapter = HTTPAdapter(
+    pool_connections=config.pool_connections,
+    pool_maxsize=config.pool_maxsize or max_workers,
+    max_retries=config.max_retries,
+  )
+  s.mount('https://', adapter)
+  s.mount('http://', adapter)
+
+  s.headers.update({'Accept-Encoding': 'gzip, deflate' if config.compression else 'identity'})
@@ -10,6 +10,8 @@ from typing import (
 ReturnMode: TypeAlias = Literal[
   'dataclass',
   'dict',
+  'audio',
+  'dataframe',  # search only; returns one pandas DataFrame
 ]
 
 XenoCantoRecord: TypeAlias = Union[
@@ -17,6 +19,7 @@ XenoCantoRecord: TypeAlias = Union[
   'XenoCantoRecordingSchema',  # noqa: F821 # type: ignore
   'XenoCantoRecording',  # noqa: F821 # type: ignore
   'XenoCantoRecordingLean',  # noqa: F821 # type: ignore
+  'XenoCantoAudio',  # noqa: F821 # type: ignore
 ]
 
 AnyRecord: TypeAlias = Union[
@@ -28,4 +31,5 @@ AnyRecord: TypeAlias = Union[
 Query: TypeAlias = Union[
   Dict[str, Any],
   'XenoCantoQuerySchema',  # noqa: F821 # type: ignore
+  'CompiledQuery',  # noqa: F821 # type: ignore
 ]
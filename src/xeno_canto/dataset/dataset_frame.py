@@ -0,0 +1,232 @@
+from xeno_canto.audio.audio_backend import require
+from xeno_canto.recording.recording_schema import XenoCantoRecordingLeanSchema
+from xeno_canto.types import QualityRating
+
+from operator import itemgetter
+from typing import (
+  Any,
+  Callable,
+  Dict,
+  Iterable,
+  List,
+  Literal,
+  Optional,
+  Tuple,
+)
+import datetime
+
+ColumnKind = Literal['int64', 'Int64', 'category', 'string', 'date', 'timedelta', 'float', 'boolean', 'list']
+
+_LEAN_FIELDS = set(XenoCantoRecordingLeanSchema.model_fields.keys())
+
+_RESOURCE_SIZES = {
+  'sonograms': ('small', 'medium', 'large', 'full'),
+  'oscillograms': ('small', 'medium', 'large'),
+}
+
+
+def _quality(v: Any) -> str:
+  return v.name if isinstance(v, QualityRating) else v
+
+
+def _time_of_day(v: datetime.time) -> datetime.timedelta:
+  return datetime.timedelta(hours=v.hour, minutes=v.minute, seconds=v.second)
+
+
+def _fields(r: Any) -> Dict[str, Any]:
+  # Schemas and dataclasses both keep their fields in __dict__; XenoCantoAudio wraps a recording there, and reading
+  # its attributes instead would go through the audio object (e.g. `sample_rate` of the decoded signal)
+  d = vars(r)
+  inner = d.get('recording')
+  return d if inner is None else vars(inner)
+
+
+def _resource_fields(v: Any) -> Optional[Dict[str, Any]]:
+  # Schemas hold resource models, dataclasses hold dicts of URLs
+  return v if v is None or isinstance(v, dict) else vars(v)
+
+
+# (column, kind, source, convert). `source` is a record field, or `field.size` for one URL of a resource, and decides
+# membership in lean frames; `convert` is applied to each non-null value
+COLUMNS: Tuple[Tuple[str, ColumnKind, str, Optional[Callable[[Any], Any]]], ...] = (
+  ('number', 'int64', 'number', None),
+  ('group', 'category', 'group', None),
+  ('genus', 'category', 'genus', None),
+  ('epithet', 'category', 'epithet', None),
+  ('subspecies', 'category', 'subspecies', None),
+  ('common_name', 'category', 'common_name', None),
+  ('recordist', 'category', 'recordist', None),
+  ('country', 'category', 'country', None),
+  ('locality', 'string', 'locality', None),
+  ('latitude', 'float', 'latitude', None),
+  ('longitude', 'float', 'longitude', None),
+  ('altitude', 'float', 'altitude', None),
+  ('quality', 'category', 'quality', _quality),
+  ('length', 'timedelta', 'length', None),
+  ('date', 'date', 'date', None),
+  ('time', 'timedelta', 'time', _time_of_day),  # Time of day, as an offset from midnight
+  ('upload_date', 'date', 'upload_date', None),
+  ('sound_type', 'list', 'sound_type', None),
+  ('sex', 'list', 'sex', None),
+  ('life_stage', 'list', 'life_stage', None),
+  ('method', 'category', 'method', None),
+  ('background', 'list', 'background', None),
+  ('seen', 'boolean', 'seen', None),
+  ('playback', 'boolean', 'playback', None),
+  ('automatic', 'boolean', 'automatic', None),
+  ('temp', 'float', 'temp', None),
+  ('device', 'string', 'device', None),
+  ('microphone', 'string', 'microphone', None),
+  ('sample_rate', 'Int64', 'sample_rate', None),
+  ('registration', 'string', 'registration', None),
+  ('remarks', 'string', 'remarks', None),
+  ('file_name', 'string', 'file_name', None),
+  ('file_download', 'string', 'file_download', str),
+  ('page', 'string', 'page', str),
+  ('license_url', 'string', 'license_url', str),
+  *(
+    (f'{field[:-1]}_{size}', 'string', f'{field}.{size}', str)
+    for field, sizes in _RESOURCE_SIZES.items()
+    for size in sizes
+  ),
+)
+
+
+class _CategoryBuffer:
+  # Each chunk is factorized on its own and its codes are remapped onto one growing category list,
+  # so only int32 codes are kept per record
+  def __init__(self, categories: Iterable[str] = ()):
+    self.chunks: List[Any] = []
+    self.index: Dict[Any, int] = {c: i for i, c in enumerate(categories)}
+
+  def extend(self, pd: Any, np: Any, values: List[Any]) -> None:
+    codes, uniques = pd.factorize(np.array(values, dtype=object))
+    lookup = np.array([self.index.setdefault(u, len(self.index)) for u in uniques] or [-1], dtype=np.int32)
+    self.chunks.append(np.where(codes < 0, -1, lookup[codes]).astype(np.int32))
+
+
+class FrameBuilder:
+  # Records are buffered one page at a time and converted column by column into typed arrays
+  def __init__(self, lean: bool = False, chunk_size: int = 500):
+    self._pd = require('pandas', extra='dataframe')
+    self._np = require('numpy', extra='dataframe')
+    self._columns = [c for c in COLUMNS if not lean or c[2].partition('.')[0] in _LEAN_FIELDS]
+    self._sources = list(dict.fromkeys(c[2].partition('.')[0] for c in self._columns))
+    self._row = itemgetter(*self._sources)
+    self._chunk_size = chunk_size
+    self._pending: List[Any] = []
+    self._chunks: Dict[str, Any] = {}
+    for name, kind, _, _ in self._columns:
+      match (name, kind):
+        case ('quality', _):
+          self._chunks[name] = _CategoryBuffer(q.name for q in QualityRating)
+        case (_, 'category'):
+          self._chunks[name] = _CategoryBuffer()
+        case _:
+          self._chunks[name] = []
+    self._rows = 0
+
+  def __len__(self) -> int:
+    return self._rows + len(self._pending)
+
+  def add(self, r: Any) -> None:
+    self._pending.append(r)
+    if len(self._pending) >= self._chunk_size:
+      self.flush()
+
+  def extend(self, records: Iterable[Any]) -> 'FrameBuilder':
+    for r in records:
+      self.add(r)
+    return self
+
+  def flush(self) -> None:
+    pd, np = self._pd, self._np
+    chunk, self._pending = self._pending, []
+    if not chunk:
+      return
+
+    # One dict lookup per record, then the chunk is transposed into per-field tuples in C
+    rows = [_fields(r) for r in chunk]
+    try:
+      fields = dict(zip(self._sources, zip(*map(self._row, rows))))
+    except KeyError:
+      # Lean dataclasses lack most fields of the full frame
+      fields = {f: tuple(d.get(f) for d in rows) for f in self._sources}
+    resources: Dict[str, List[Any]] = {}
+
+    for name, kind, source, convert in self._columns:
+      values = self._values(fields, resources, source)
+      if convert is not None:
+        values = [None if v is None else convert(v) for v in values]
+      buf = self._chunks[name]
+      match kind:
+        case 'category':
+          buf.extend(pd, np, values)
+        case 'int64':
+          buf.append(np.array(values, dtype=np.int64))
+        case 'Int64' | 'float':
+          # None becomes NaN here and the mask at build time
+          buf.append(np.array(values, dtype=np.float64))
+        case 'boolean':
+          buf.append(np.array([v is True for v in values]))
+          buf.append(np.array([v is None for v in values]))
+        case 'date':
+          buf.append(np.array(values, dtype='datetime64[D]'))
+        case 'timedelta':
+          buf.append(np.array(values, dtype='timedelta64[s]'))
+        case 'list':
+          buf.extend(tuple(v) if isinstance(v, (list, tuple)) else () if v is None else (v,) for v in values)
+        case _:
+          buf.extend(values)
+
+    self._rows += len(chunk)
+
+  @staticmethod
+  def _values(fields: Dict[str, Any], resources: Dict[str, List[Any]], source: str) -> Any:
+    field, _, size = source.partition('.')
+    if not size:
+      return fields[field]
+    if field not in resources:
+      resources[field] = [_resource_fields(v) for v in fields[field]]
+    return [None if d is None else d.get(size) for d in resources[field]]
+
+  def build(self) -> Any:
+    self.flush()
+    pd, np = self._pd, self._np
+
+    def concat(arrays: List[Any], dtype: Any) -> Any:
+      return np.concatenate(arrays) if arrays else np.empty(0, dtype=dtype)
+
+    data: Dict[str, Any] = {}
+    for name, kind, _, _ in self._columns:
+      buf = self._chunks[name]
+      match kind:
+        case 'category':
+          data[name] = pd.Categorical.from_codes(concat(buf.chunks, np.int32), categories=list(buf.index))
+        case 'int64':
+          data[name] = concat(buf, np.int64)
+        case 'Int64':
+          values = concat(buf, np.float64)
+          mask = np.isnan(values)
+          data[name] = pd.arrays.IntegerArray(np.where(mask, 0, values).astype(np.int64), mask)
+        case 'float':
+          values = concat(buf, np.float64)
+          data[name] = pd.arrays.FloatingArray(values, np.isnan(values))
+        case 'boolean':
+          data[name] = pd.arrays.BooleanArray(concat(buf[0::2], bool), concat(buf[1::2], bool))
+        case 'string':
+          data[name] = pd.array(buf, dtype='string')
+        case 'date':
+          data[name] = concat(buf, 'datetime64[D]').astype('datetime64[s]')
+        case 'timedelta':
+          data[name] = concat(buf, 'timedelta64[s]')
+        case 'list':
+          col = np.empty(len(buf), dtype=object)
+          col[:] = buf
+          data[name] = col
+
+    return pd.DataFrame(data, copy=False)
+
+
+def to_dataframe(records: Iterable[Any], lean: bool = False) -> Any:
+  return FrameBuilder(lean=lean).extend(records).build()
@@ -0,0 +1,131 @@
+from xeno_canto.audio.audio_backend import require
+from xeno_canto.audio.audio_processing import (
+  resample_batch,
+  segment,
+)
+
+from pathlib import Path
+from typing import (
+  Any,
+  Callable,
+  Dict,
+  Iterable,
+  Optional,
+  Union,
+)
+import json
+
+_PCM_FILE = 'segments.pcm'
+_INDEX_FILE = 'index.npy'
+_META_FILE = 'dataset.json'
+
+INDEX_DTYPE = [
+  ('number', '<u4'),
+  ('offset', '<u8'),  # Sample offset of the window within its recording
+  ('label', '<i4'),
+]
+
+
+class SegmentDatasetBuilder:
+  # Decodes each recording once and appends its windows to one contiguous PCM file
+  def __init__(
+    self,
+    root: Union[str, Path],
+    sample_rate: int = 32000,
+    window_seconds: float = 3.0,
+    hop_seconds: Optional[float] = None,
+    dtype: str = 'int16',
+    label: Callable[[Any], str] = lambda a: f'{a.genus} {a.epithet}',
+  ):
+    self._root = Path(root)
+    self._sample_rate = sample_rate
+    self._window_seconds = window_seconds
+    self._hop_seconds = hop_seconds or window_seconds
+    self._dtype = dtype
+    self._label = label
+
+  def build(self, audios: Iterable[Any]) -> 'SegmentDataset':
+    # `audios` are XenoCantoAudio records; each is loaded, decoded, windowed and released in turn
+    np = require('numpy')
+
+    self._root.mkdir(parents=True, exist_ok=True)
+    window = int(round(self._window_seconds * self._sample_rate))
+    hop = int(round(self._hop_seconds * self._sample_rate))
+
+    labels: Dict[str, int] = {}
+    index_parts = []
+
+    with (self._root / _PCM_FILE).open('wb') as pcm:
+      for a in audios:
+        was_loaded = a.loaded
+        try:
+          x = a.load().to_numpy(mono=True)
+          rate = a.sample_rate
+        finally:
+          if not was_loaded:
+            a.release()
+
+        (x,) = resample_batch([x], [rate], self._sample_rate)
+        windows = segment(x, self._sample_rate, self._window_seconds, self._hop_seconds, pad=False)
+        if not len(windows):
+          continue
+
+        if self._dtype == 'int16':
+          windows = np.clip(windows * 32767.0, -32768, 32767).astype(np.int16)
+        else:
+          windows = windows.astype(self._dtype)
+        pcm.write(np.ascontiguousarray(windows).tobytes())
+
+        entries = np.empty(len(windows), dtype=INDEX_DTYPE)
+        entries['number'] = a.recording.number
+        entries['offset'] = np.arange(len(windows)) * hop
+        entries['label'] = labels.setdefault(self._label(a), len(labels))
+        index_parts.append(entries)
+
+    index = np.concatenate(index_parts) if index_parts else np.empty(0, dtype=INDEX_DTYPE)
+    np.save(self._root / _INDEX_FILE, index)
+
+    meta = dict(
+      sample_rate=self._sample_rate,
+      window=window,
+      hop=hop,
+      dtype=self._dtype,
+      labels=sorted(labels, key=labels.__getitem__),
+    )
+    (self._root / _META_FILE).write_text(json.dumps(meta, indent=2), encoding='utf-8')
+
+    return SegmentDataset(self._root)
+
+
+class SegmentDataset:
+  # Opening only maps the files; segments are zero-copy views into the PCM memory map
+  def __init__(self, root: Union[str, Path]):
+    np = require('numpy')
+
+    self._root = Path(root)
+    meta = json.loads((self._root / _META_FILE).read_text(encoding='utf-8'))
+
+    self.sample_rate: int = meta['sample_rate']
+    self.window: int = meta['window']
+    self.hop: int = meta['hop']
+    self.labels = meta['labels']
+    self.index = np.load(self._root / _INDEX_FILE, mmap_mode='r')
+
+    if len(self.index):
+      self.segments = np.memmap(
+        self._root / _PCM_FILE,
+        dtype=meta['dtype'],
+        mode='r',
+        shape=(len(self.index), self.window),
+      )
+    else:
+      self.segments = np.empty((0, self.window), dtype=meta['dtype'])
+
+  def __len__(self) -> int:
+    return len(self.index)
+
+  def __getitem__(self, i: Any) -> Any:
+    return self.segments[i]
+
+  def label(self, i: int) -> str:
+    return self.labels[int(self.index['label'][i])]
@@ -0,0 +1,183 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+  Any,
+  Dict,
+  Iterator,
+  List,
+  Optional,
+  Tuple,
+  Union,
+)
+import io
+import json
+import os
+import tarfile
+import time
+
+_BLOCK = tarfile.BLOCKSIZE
+_INDEX_SUFFIX = '.idx.json'
+
+# key -> {extension: (offset, size)}
+ShardIndex = Dict[str, Dict[str, Tuple[int, int]]]
+
+
+@dataclass(frozen=True)
+class ShardSample:
+  key: str
+  ext: str
+  data: bytes
+  metadata: Dict[str, Any]
+
+  @property
+  def number(self) -> int:
+    return int(self.key.removeprefix('xc'))
+
+
+class _OpenShard:
+  def __init__(self, path: Path):
+    self.path = path
+    self.tar = tarfile.open(path, mode='w', format=tarfile.USTAR_FORMAT)
+    self.index: ShardIndex = {}
+
+  @property
+  def size(self) -> int:
+    return self.tar.offset
+
+  def add(self, key: str, ext: str, data: bytes) -> None:
+    info = tarfile.TarInfo(f'{key}.{ext}')
+    info.size = len(data)
+    info.mtime = int(time.time())
+    self.tar.addfile(info, io.BytesIO(data))
+
+    # Data ends at the (block-padded) archive offset; its header precedes it
+    offset = self.tar.offset - -(-len(data) // _BLOCK) * _BLOCK
+    self.index.setdefault(key, {})[ext] = (offset, len(data))
+
+  def close(self) -> None:
+    self.tar.close()
+
+    tmp = self.path.with_name(self.path.name + _INDEX_SUFFIX + '.tmp')
+    tmp.write_text(json.dumps(self.index), encoding='utf-8')
+    os.replace(tmp, self.path.with_name(self.path.name + _INDEX_SUFFIX))
+
+
+class ShardWriter:
+  # WebDataset-style tar shards: each sample is `<key>.<ext>` plus `<key>.json`, with a sidecar offset index
+  DEFAULT_SHARD_SIZE = 1 << 30
+
+  def __init__(self, root: Union[str, Path], shard_size: int = DEFAULT_SHARD_SIZE, prefix: str = 'shard'):
+    if shard_size < 1:
+      raise ValueError(shard_size)
+
+    self._root = Path(root)
+    self._shard_size = shard_size
+    self._prefix = prefix
+    self._open: Dict[str, _OpenShard] = {}
+    self._counts: Dict[str, int] = {}
+
+  def __enter__(self) -> 'ShardWriter':
+    return self
+
+  def __exit__(self, *exc) -> None:
+    self.close()
+
+  def _shard(self, group: str) -> _OpenShard:
+    shard = self._open.get(group)
+    if shard is not None and shard.size < self._shard_size:
+      return shard
+
+    if shard is not None:
+      shard.close()
+
+    n = self._counts.get(group, 0)
+    self._counts[group] = n + 1
+
+    d = self._root / group
+    d.mkdir(parents=True, exist_ok=True)
+    shard = self._open[group] = _OpenShard(d / f'{self._prefix}-{n:05d}.tar')
+    return shard
+
+  def write(self, group: str, key: str, data: bytes, ext: str, metadata: Dict[str, Any]) -> None:
+    shard = self._shard(group)
+    shard.add(key, ext, data)
+    shard.add(key, 'json', json.dumps(metadata).encode('utf-8'))
+
+  def close(self) -> None:
+    for shard in self._open.values():
+      shard.close()
+    self._open.clear()
+
+
+class ShardReader:
+  def __init__(self, root: Union[str, Path]):
+    self._root = Path(root)
+    self._index: Optional[Dict[str, Tuple[Path, Dict[str, Tuple[int, int]]]]] = None
+
+  @property
+  def shards(self) -> List[Path]:
+    return sorted(self._root.rglob('*.tar'))
+
+  def _load_index(self) -> Dict[str, Tuple[Path, Dict[str, Tuple[int, int]]]]:
+    if self._index is None:
+      self._index = {}
+      for shard in self.shards:
+        entries: ShardIndex = json.loads(shard.with_name(shard.name + _INDEX_SUFFIX).read_text(encoding='utf-8'))
+        for key, members in entries.items():
+          self._index[key] = (shard, members)
+    return self._index
+
+  def keys(self) -> List[str]:
+    return list(self._load_index())
+
+  def __len__(self) -> int:
+    return len(self._load_index())
+
+  def __contains__(self, key: Union[str, int]) -> bool:
+    return self._key(key) in self._load_index()
+
+  @staticmethod
+  def _key(key: Union[str, int]) -> str:
+    return f'xc{key}' if isinstance(key, int) else key
+
+  @staticmethod
+  def _sample(key: str, members: Dict[str, bytes]) -> ShardSample:
+    metadata = json.loads(members.pop('json', b'{}'))
+    ext, data = next(iter(members.items()), ('', b''))
+    return ShardSample(key=key, ext=ext, data=data, metadata=metadata)
+
+  def get(self, key: Union[str, int]) -> ShardSample:
+    # O(1): one index lookup, then a seek per member
+    key = self._key(key)
+    shard, entries = self._load_index()[key]
+
+    members: Dict[str, bytes] = {}
+    with shard.open('rb') as f:
+      for ext, (offset, size) in entries.items():
+        f.seek(offset)
+        members[ext] = f.read(size)
+
+    return self._sample(key, members)
+
+  def __getitem__(self, key: Union[str, int]) -> ShardSample:
+    return self.get(key)
+
+  def __iter__(self) -> Iterator[ShardSample]:
+    # Sequential streaming read; members of a sample are adjacent in the archive
+    for shard in self.shards:
+      with tarfile.open(shard, mode='r|') as tar:
+        key: Optional[str] = None
+        members: Dict[str, bytes] = {}
+
+        for info in tar:
+          k, _, ext = info.name.partition('.')
+          if key is not None and k != key:
+            yield self._sample(key, members)
+            members = {}
+
+          key = k
+          f = tar.extractfile(info)
+          members[ext] = f.read() if f is not None else b''
+
+        if key is not None:
+          yield self._sample(key, members)
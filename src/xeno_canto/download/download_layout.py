@@ -0,0 +1,87 @@
+from dataclasses import fields, is_dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import (
+  Any,
+  Dict,
+  Literal,
+  Optional,
+  Union,
+)
+import json
+import re
+
+import pydantic
+
+Grouping = Literal['flat', 'species', 'recordist']
+Naming = Literal['original', 'catalogue']
+ImageKind = Literal['sonogram', 'oscillogram']
+ImageSize = Literal['small', 'medium', 'large', 'full']
+
+_WS_PATTERN = re.compile(r'\s+')
+
+
+def master_dir(target_dir: Optional[Union[str, Path]] = None, prefix: str = 'xc-recordings') -> Path:
+  if target_dir is None:
+    # Generate safe timestamp: 2026-01-02T13-57-53
+    timestamp = datetime.now().isoformat(timespec='seconds').replace(':', '-')
+    return Path.cwd() / f'{prefix}-{timestamp}'
+
+  return Path(target_dir)
+
+
+def group_dir(r: Any, grouping: Grouping, sep: str = '-', replace_ws: bool = False) -> str:
+  # Relative directory of a recording under the master directory; '' for a flat layout
+  if grouping == 'species':
+    name = (r.genus + sep + r.epithet).lower()
+
+  elif grouping == 'recordist':
+    name = r.recordist.lower() if r.recordist is not None else 'unknown'
+
+  else:
+    return ''
+
+  return _WS_PATTERN.sub(sep, name) if replace_ws else name
+
+
+def file_name(r: Any, naming: Naming) -> str:
+  name = r.file_name or f'XC{r.number}.mp3'
+
+  if naming == 'catalogue':
+    return str(Path(name).with_stem(str(r.number)))
+
+  return name
+
+
+def image_url(r: Any, kind: ImageKind, size: ImageSize) -> Optional[str]:
+  images = r.sonograms if kind == 'sonogram' else r.oscillograms
+  if images is None:
+    return None
+
+  # Schemas hold resource models, dataclasses hold their dumped dicts
+  url = images.get(size) if isinstance(images, dict) else getattr(images, size, None)
+  return str(url) if url else None
+
+
+def image_name(r: Any, naming: Naming, kind: ImageKind, size: ImageSize, url: str) -> str:
+  # Images sit next to the audio file and share its stem, e.g. XC1234-song.sonogram-small.png
+  stem = Path(file_name(r, naming)).stem
+  ext = Path(url.split('?', 1)[0]).suffix or '.png'
+  return f'{stem}.{kind}-{size}{ext}'
+
+
+def record_metadata(r: Any) -> Dict[str, Any]:
+  # JSON-safe metadata of any record type (pydantic schema, dataclass, or audio wrapper)
+  r = getattr(r, 'recording', r)
+
+  if isinstance(r, pydantic.BaseModel):
+    return r.model_dump(mode='json', exclude_computed_fields=True)
+
+  if is_dataclass(r):
+    data = {f.name: getattr(r, f.name) for f in fields(r)}
+    return json.loads(json.dumps(data, default=str))
+
+  if isinstance(r, dict):
+    return json.loads(json.dumps(r, default=str))
+
+  raise TypeError(type(r))
@@ -0,0 +1,96 @@
+from pathlib import Path
+from typing import (
+  Iterable,
+  Literal,
+  Optional,
+  Union,
+)
+import hashlib
+import os
+import shutil
+import tempfile
+
+LinkMode = Literal['hardlink', 'symlink', 'copy']
+
+
+class ObjectStore:
+  # Files live once under objects/<sha256[:2]>/<sha256>; refs/xc<number>.<variant> names the object of a recording
+  def __init__(self, root: Union[str, Path]):
+    self._root = Path(root).resolve()
+    self._objects = self._root / 'objects'
+    self._refs = self._root / 'refs'
+    self._tmp = self._root / 'tmp'
+
+    for d in (self._objects, self._refs, self._tmp):
+      d.mkdir(parents=True, exist_ok=True)
+
+  @property
+  def root(self) -> Path:
+    return self._root
+
+  def _ref(self, number: int, variant: str) -> Path:
+    return self._refs / f'xc{number}.{variant}'
+
+  def _object(self, digest: str) -> Path:
+    return self._objects / digest[:2] / digest
+
+  def lookup(self, number: int, variant: str = 'full') -> Optional[Path]:
+    ref = self._ref(number, variant)
+    if not ref.exists():
+      return None
+
+    obj = self._object(ref.read_text(encoding='ascii').strip())
+    return obj if obj.exists() else None
+
+  def put(self, number: int, chunks: Iterable[Union[bytes, memoryview]], variant: str = 'full') -> Path:
+    h = hashlib.sha256()
+
+    fd, tmp_name = tempfile.mkstemp(dir=self._tmp)
+    tmp = Path(tmp_name)
+    try:
+      with os.fdopen(fd, 'wb') as f:
+        for chunk in chunks:
+          h.update(chunk)
+          f.write(chunk)
+
+      digest = h.hexdigest()
+      obj = self._object(digest)
+      if obj.exists():
+        # Same content is already stored (e.g. under another number or variant)
+        tmp.unlink()
+      else:
+        obj.parent.mkdir(exist_ok=True)
+        tmp.replace(obj)
+
+    except BaseException:
+      tmp.unlink(missing_ok=True)
+      raise
+
+    ref = self._ref(number, variant)
+    ref_tmp = ref.with_name(ref.name + '.tmp')
+    ref_tmp.write_text(digest, encoding='ascii')
+    ref_tmp.replace(ref)
+
+    return obj
+
+  def link(self, obj: Path, dest: Path, mode: LinkMode = 'hardlink') -> None:
+    if dest.exists() or dest.is_symlink():
+      if dest.exists() and os.path.samefile(obj, dest):
+        return
+      dest.unlink()
+
+    dest.parent.mkdir(parents=True, exist_ok=True)
+
+    if mode == 'symlink':
+      dest.symlink_to(obj)
+      return
+
+    if mode == 'hardlink':
+      try:
+        os.link(obj, dest)
+        return
+      except OSError:
+        # Hardlinks can't cross filesystems; fall back to a copy
+        pass
+
+    shutil.copyfile(obj, dest)
@@ -0,0 +1,35 @@
+from typing import (
+  Any,
+  BinaryIO,
+  Callable,
+  Iterator,
+  Union,
+)
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+ChunkSink = Union[BinaryIO, Callable[[memoryview], Any]]
+
+
+def iter_chunks(resp: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[memoryview]:
+  # Reads a streamed response into one reusable buffer; each chunk is only valid until the next one is requested
+  buf = bytearray(chunk_size)
+  view = memoryview(buf)
+
+  try:
+    while n := resp.raw.readinto(buf):
+      yield view[:n]
+  finally:
+    view.release()
+    resp.close()
+
+
+def feed(chunks: Iterator[memoryview], sink: ChunkSink) -> int:
+  write = sink.write if hasattr(sink, 'write') else sink  # type: ignore
+  total = 0
+
+  for chunk in chunks:
+    write(chunk)
+    total += len(chunk)
+
+  return total
@@ -0,0 +1,91 @@
+from xeno_canto.query.query_schema import XenoCantoQuerySchema
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import (
+  Any,
+  Dict,
+  Iterator,
+  Optional,
+  Tuple,
+  Union,
+)
+from urllib.parse import quote_plus
+import hashlib
+
+Term = Tuple[str, str]
+
+
+# NOTE Terms are sorted, so equal queries share the same string and fingerprint regardless of argument order
+@dataclass(frozen=True)
+class CompiledQuery:
+  terms: Tuple[Term, ...]
+  query_string: str  # e.g. 'cnt:"united kingdom" gen:apus'
+  encoded: str  # e.g. 'cnt%3A%22united+kingdom%22+gen%3Aapus'
+  fingerprint: str
+
+  def __str__(self):
+    return self.query_string
+
+  def get(self, tag: str) -> Optional[str]:
+    for k, v in self.terms:
+      if k == tag:
+        return v.strip('"')
+    return None
+
+  def replace(self, **tags: Any) -> 'CompiledQuery':
+    # NOTE Keyword names are raw API tags (e.g. nr='1-500'); pass None to drop a tag
+    kept = {k: v for k, v in self.terms if k not in tags}
+    overrides = {k: v for k, v in tags.items() if v is not None}
+    return _compile_terms(_normalize_terms({**kept, **overrides}))
+
+
+def _format_value(v: Any) -> str:
+  if isinstance(v, bool):
+    return 'yes' if v else 'no'
+
+  s = str(v).strip()
+  if any(c.isspace() for c in s) and not (s.startswith('"') and s.endswith('"')):
+    s = f'"{s}"'
+  return s
+
+
+def _iter_terms(query: Dict[str, Any]) -> Iterator[Term]:
+  for k, v in query.items():
+    if v is None:
+      continue
+
+    if isinstance(v, (list, tuple, set)):
+      for u in v:
+        yield k, _format_value(u)
+    else:
+      yield k, _format_value(v)
+
+
+def _normalize_terms(query: Dict[str, Any]) -> Tuple[Term, ...]:
+  return tuple(sorted(set(_iter_terms(query))))
+
+
+@lru_cache(maxsize=1024)
+def _compile_terms(terms: Tuple[Term, ...]) -> CompiledQuery:
+  query_string = ' '.join(f'{k}:{v}' for k, v in terms)
+
+  return CompiledQuery(
+    terms=terms,
+    query_string=query_string,
+    encoded=quote_plus(query_string, safe=''),
+    fingerprint=hashlib.sha1(query_string.encode('utf-8')).hexdigest()[:16],
+  )
+
+
+def compile_query(query: Union[Dict[str, Any], XenoCantoQuerySchema, CompiledQuery]) -> CompiledQuery:
+  if isinstance(query, CompiledQuery):
+    return query
+
+  if isinstance(query, XenoCantoQuerySchema):
+    query = query.model_dump(
+      exclude_none=True,
+      exclude_computed_fields=True,
+    )
+
+  return _compile_terms(_normalize_terms(query))
@@ -9,11 +9,14 @@ from typing import (
   Sequence,
   List,
 )
+from pydantic import TypeAdapter
 import yarl
 import pathlib
 import dateutil.parser as dtparser
 import datetime
 
+_TIMEDELTA_ADAPTER = TypeAdapter(datetime.timedelta)
+
 INVALID_STRING_INPUTS = [
   '',
   '?',
@@ -193,9 +196,18 @@ def validate_dt_timedelta(v):
     return v
 
   elif isinstance(v, str):
+    if v.startswith('P'):
+      # ISO 8601, as emitted by model_dump(mode='json')
+      return _TIMEDELTA_ADAPTER.validate_python(v)
+
     try:
-      mm, ss = map(int, v.split(':'))
-      return datetime.timedelta(minutes=mm, seconds=ss)
+      parts = list(map(int, v.split(':')))
+      if not 2 <= len(parts) <= 3:
+        raise ValueError(v)
+      seconds = 0
+      for part in parts:
+        seconds = seconds * 60 + part
+      return datetime.timedelta(seconds=seconds)
 
     except (ValueError, IndexError):
       raise ValueError(v) from None
@@ -236,6 +248,9 @@ def validate_xc_quality(v):
   if isinstance(v, str):
     return QualityRating[v.capitalize()]
 
+  if isinstance(v, int):
+    return QualityRating(v)
+
   raise ValueError(v)
 
 
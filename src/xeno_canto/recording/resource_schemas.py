@@ -10,6 +10,7 @@ from pydantic import (
 class OscillogramsSchema(BaseModel):
   model_config = ConfigDict(
     arbitrary_types_allowed=True,
+    populate_by_name=True,  # Stored records are dumped as `medium`, the API sends `med`
   )
 
   small: UrlField = Field(default=None)
@@ -20,6 +21,7 @@ class OscillogramsSchema(BaseModel):
 class SonogramsSchema(BaseModel):
   model_config = ConfigDict(
     arbitrary_types_allowed=True,
+    populate_by_name=True,  # Stored records are dumped as `medium`, the API sends `med`
   )
 
   small: UrlField = Field(default=None)
@@ -0,0 +1,66 @@
+from xeno_canto.recording.recording_schema import XenoCantoRecordingSchema
+
+import pytest
+
+
+def raw_record(number: int, **overrides) -> dict:
+  # One recording as the API returns it
+  raw = {
+    'id': str(number),
+    'gen': 'Apus',
+    'sp': 'apus',
+    'ssp': '',
+    'grp': 'birds',
+    'en': 'Common Swift',
+    'rec': 'Jane Doe',
+    'cnt': 'Spain',
+    'loc': 'Barcelona',
+    'lat': '41.5',
+    'lon': '2.1',
+    'alt': '100',
+    'type': 'call',
+    'sex': 'male',
+    'stage': 'adult',
+    'method': 'field recording',
+    'url': f'//xeno-canto.org/{number}',
+    'file': f'https://xeno-canto.org/{number}/download',
+    'file-name': f'XC{number}-swift.mp3',
+    'sono': {
+      'small': f'//xeno-canto.org/sounds/uploaded/ABC/ffts/XC{number}-small.png',
+      'med': f'//xeno-canto.org/sounds/uploaded/ABC/ffts/XC{number}-med.png',
+      'large': f'//xeno-canto.org/sounds/uploaded/ABC/ffts/XC{number}-large.png',
+      'full': f'//xeno-canto.org/sounds/uploaded/ABC/ffts/XC{number}-full.png',
+    },
+    'osci': {
+      'small': f'//xeno-canto.org/sounds/uploaded/ABC/wave/XC{number}-small.png',
+      'med': f'//xeno-canto.org/sounds/uploaded/ABC/wave/XC{number}-med.png',
+      'large': f'//xeno-canto.org/sounds/uploaded/ABC/wave/XC{number}-large.png',
+    },
+    'lic': '//creativecommons.org/licenses/by-nc-sa/4.0/',
+    'q': 'A',
+    'length': '0:10',
+    'time': '08:00',
+    'date': '2020-05-01',
+    'uploaded': '2020-06-01',
+    'also': [],
+    'rmk': '',
+    'animal-seen': 'yes',
+    'playback-used': 'no',
+    'temp': '',
+    'regnr': '',
+    'auto': 'no',
+    'dvc': '',
+    'mic': '',
+    'smp': '44100',
+  }
+  raw.update(overrides)
+  return raw
+
+
+@pytest.fixture
+def records():
+  return [
+    XenoCantoRecordingSchema.model_validate(raw_record(1)),
+    XenoCantoRecordingSchema.model_validate(raw_record(2, gen='Parus', sp='major', en='Great Tit', cnt='Germany')),
+    XenoCantoRecordingSchema.model_validate(raw_record(5, lat='', lon='', sono={}, osci={})),
+  ]
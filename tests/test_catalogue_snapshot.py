@@ -0,0 +1,39 @@
+from xeno_canto.catalogue.catalogue_diff import normalize_record
+from xeno_canto.catalogue.catalogue_snapshot import write_snapshot
+from xeno_canto.catalogue.catalogue_store import RecordStore
+from xeno_canto.recording.recording import XenoCantoRecording
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+
+class _GrowingStore(RecordStore):
+  # Reports fewer records than it yields, like a store synced while a snapshot is written
+  def __len__(self) -> int:
+    return 1
+
+
+def test_snapshot_round_trip(tmp_path, records):
+  with RecordStore(tmp_path / 'records.db') as store:
+    store.sync(records)
+    snap = write_snapshot(store, tmp_path / 'snap', batch_size=2)
+
+  assert len(snap) == len(records)
+  for i, r in enumerate(records):
+    assert snap.raw(i) == normalize_record(r)
+    assert snap[i] == XenoCantoRecording.from_pydantic(r)
+    assert str(snap[i].sonograms['medium']) == str(r.sonograms.medium)
+
+
+def test_snapshot_columns(tmp_path, records):
+  with _GrowingStore(tmp_path / 'records.db') as store:
+    store.sync(records)
+    snap = write_snapshot(store, tmp_path / 'snap', batch_size=1)
+
+  assert snap.numbers.tolist() == [1, 2, 5]
+  assert snap.column('genus').tolist() == ['Apus', 'Parus', 'Apus']
+  assert snap.equals('country', 'Germany').tolist() == [False, True, False]
+  assert np.isnan(snap.column('latitude')[2])
+  assert snap.column('length').tolist() == [10, 10, 10]
+  assert snap.get(2).common_name == 'Great Tit'
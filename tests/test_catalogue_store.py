@@ -0,0 +1,28 @@
+from xeno_canto.catalogue.catalogue_diff import (
+  content_hash,
+  normalize_record,
+)
+from xeno_canto.catalogue.catalogue_store import RecordStore
+
+
+def test_store_round_trip(tmp_path, records):
+  with RecordStore(tmp_path / 'records.db') as store:
+    store.sync(records)
+
+    for r in records:
+      loaded = store[int(r.number)]
+      assert loaded == r
+      assert loaded.sonograms.medium == r.sonograms.medium
+      assert loaded.oscillograms.medium == r.oscillograms.medium
+      assert content_hash(normalize_record(loaded)) == store.content_hash(int(r.number))
+
+    assert list(store) == records
+
+
+def test_resync_of_loaded_records_is_unchanged(tmp_path, records):
+  with RecordStore(tmp_path / 'records.db') as store:
+    store.sync(records)
+    diff = store.sync(list(store))
+
+  assert not diff.added and not diff.changed and not diff.removed
+  assert diff.unchanged == len(records)
@@ -0,0 +1,43 @@
+from xeno_canto.audio.audio import XenoCantoAudio
+from xeno_canto.dataset.dataset_frame import to_dataframe
+from xeno_canto.recording.recording import (
+  XenoCantoRecording,
+  XenoCantoRecordingLean,
+)
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+
+def _never_fetch(recording, max_seconds):
+  raise AssertionError('metadata columns must not load audio')
+
+
+def test_schemas_dataclasses_and_audio_give_the_same_frame(records):
+  dataclasses = [XenoCantoRecording.from_pydantic(r) for r in records]
+  audios = [XenoCantoAudio(r, _never_fetch) for r in dataclasses]
+
+  expected = to_dataframe(records)
+  pd.testing.assert_frame_equal(to_dataframe(dataclasses), expected)
+  pd.testing.assert_frame_equal(to_dataframe(audios), expected)
+
+
+def test_columns(records):
+  df = to_dataframe(records)
+
+  assert df['number'].tolist() == [1, 2, 5]
+  assert df['genus'].tolist() == ['Apus', 'Parus', 'Apus']
+  assert df['sample_rate'].dtype == 'Int64'
+  assert df['sonogram_medium'][0] == 'https://xeno-canto.org/sounds/uploaded/ABC/ffts/XC1-med.png'
+  assert df['oscillogram_medium'][0] == 'https://xeno-canto.org/sounds/uploaded/ABC/wave/XC1-med.png'
+  assert df['sonogram_medium'].isna()[2]
+  assert df['latitude'].isna()[2]
+
+
+def test_lean_frame_of_lean_records(records):
+  lean = [XenoCantoRecordingLean.from_pydantic(r) for r in records]
+  df = to_dataframe(lean, lean=True)
+
+  assert 'group' not in df.columns
+  pd.testing.assert_frame_equal(df, to_dataframe(records, lean=True))